@@ -1,16 +1,20 @@
-from flask import Flask, render_template, request, redirect, url_for, flash, send_file, session
+from flask import Flask, render_template, request, redirect, url_for, flash, send_file, session, Response, \
+    send_from_directory, jsonify
 import os
+import tempfile
 from werkzeug.utils import secure_filename
 from auth import verificar_password, hash_password
-from modules.insertar_columna import procesar_excel
-from modules.pasar_data import procesar_transferencia, obtener_hojas_analisis
 from modules.cambiar_password import cambiar_password_web, generar_hash_password  # ✅ Nuevo import
+from modules import metricas, perfilado
+from modules.exportacion import FORMATOS_EXPORTACION, archivos_exportados, ruta_hoja
 from datetime import datetime
 
 app = Flask(__name__)
 app.secret_key = 'tu_clave_secreta_aqui'
 app.config['UPLOAD_FOLDER'] = 'static/uploads'
 app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024
+# Porcentaje de procesamientos que se perfilan automáticamente (0 = solo bajo demanda con ?perfilar=1)
+app.config['PERFILADO_PORCENTAJE'] = float(os.environ.get('EXCEL_TOOLS_PERFILADO_PORCENTAJE', 0))
 
 os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
 
@@ -84,11 +88,61 @@ def insertar_columna():
             return redirect(request.url)
 
         if file and allowed_file(file.filename):
+            # Importación diferida: openpyxl se carga con la primera solicitud que lo necesita
+            from modules.insertar_columna import procesar_excel, previsualizar_excel
+
+            if request.form.get('previsualizar'):
+                def previsualizar_hojas(ruta, max_filas=None):
+                    # La previsualización analiza una sola hoja: la primera de las seleccionadas o la activa
+                    seleccionadas = []
+                    if request.form.get('multihoja'):
+                        from modules.lectores import listar_hojas
+
+                        hojas = hojas_solicitadas()
+                        seleccionadas = [hoja for hoja in listar_hojas(ruta) if not hojas or hoja in hojas]
+                    previsualizacion = previsualizar_excel(ruta, max_filas,
+                                                           hoja=seleccionadas[0] if seleccionadas else None)
+                    previsualizacion['hojas_sin_analizar'] = seleccionadas[1:]
+                    return previsualizacion
+
+                try:
+                    previsualizacion = previsualizar_subida(file, previsualizar_hojas)
+                except Exception as e:
+                    flash(f'Error al previsualizar el archivo: {str(e)}', 'error')
+                    return redirect(request.url)
+                return responder_previsualizacion(previsualizacion, 'insertar_columna')
+
             filename = secure_filename(file.filename)
             filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
             file.save(filepath)
 
-            resultado, archivo_procesado, patrones_encontrados = procesar_excel(filepath)
+            formatos = formatos_solicitados()
+
+            if request.form.get('multihoja'):
+                from modules.insertar_columna import procesar_excel_multihoja
+
+                resultado, archivo_procesado, patrones_por_hoja = ejecutar_trabajo(
+                    'insertar_columna', procesar_excel_multihoja, filepath, hojas_solicitadas() or None, formatos
+                )
+
+                if resultado:
+                    ruta_procesado = os.path.join(app.config['UPLOAD_FOLDER'], archivo_procesado)
+                    return render_template('resultado.html',
+                                           exitoso=True,
+                                           archivo=filename,
+                                           patrones_encontrados=sum(patrones_por_hoja.values()),
+                                           patrones_por_hoja=patrones_por_hoja,
+                                           archivo_descarga=archivo_procesado,
+                                           exportaciones=[exportado for hoja in patrones_por_hoja
+                                                          for exportado in archivos_exportados(
+                                                              ruta_hoja(ruta_procesado, hoja), formatos)],
+                                           now=datetime.now())
+                flash('Error al procesar el archivo', 'error')
+                return redirect(request.url)
+
+            resultado, archivo_procesado, patrones_encontrados = ejecutar_trabajo(
+                'insertar_columna', procesar_excel, filepath, formatos
+            )
 
             if resultado:
                 return render_template('resultado.html',
@@ -96,6 +150,8 @@ def insertar_columna():
                                        archivo=filename,
                                        patrones_encontrados=patrones_encontrados,
                                        archivo_descarga=archivo_procesado,
+                                       exportaciones=archivos_exportados(
+                                           os.path.join(app.config['UPLOAD_FOLDER'], archivo_procesado), formatos),
                                        now=datetime.now())
             else:
                 flash('Error al procesar el archivo', 'error')
@@ -117,6 +173,29 @@ def pasar_data():
             flash('Contraseña incorrecta', 'error')
             return redirect(request.url)
 
+        # Previsualización: solo se analiza el archivo origen, el destino no se modifica
+        if request.form.get('previsualizar'):
+            file_origen = request.files.get('file_origen')
+            if not file_origen or not allowed_file(file_origen.filename):
+                flash('Debe seleccionar el archivo origen', 'error')
+                return redirect(request.url)
+
+            from modules.pasar_data import previsualizar_transferencia, obtener_hojas_analisis
+
+            def previsualizar_origen(ruta, max_filas=None):
+                hojas_analisis = obtener_hojas_analisis(ruta)
+                hoja = request.form.get('hoja_analisis')
+                if hoja not in hojas_analisis:
+                    hoja = hojas_analisis[0]
+                return previsualizar_transferencia(ruta, hoja, max_filas)
+
+            try:
+                previsualizacion = previsualizar_subida(file_origen, previsualizar_origen)
+            except Exception as e:
+                flash(f'Error al previsualizar el archivo: {str(e)}', 'error')
+                return redirect(request.url)
+            return responder_previsualizacion(previsualizacion, 'pasar_data')
+
         # Verificar archivos
         if 'file_origen' not in request.files or 'file_destino' not in request.files:
             flash('Debe seleccionar ambos archivos', 'error')
@@ -131,6 +210,8 @@ def pasar_data():
 
         if (file_origen and allowed_file(file_origen.filename) and
                 file_destino and allowed_file(file_destino.filename)):
+            # Importación diferida: pandas se carga con la primera solicitud que lo necesita
+            from modules.pasar_data import procesar_transferencia, obtener_hojas_analisis
 
             # Guardar archivos
             filename_origen = secure_filename(file_origen.filename)
@@ -155,8 +236,10 @@ def pasar_data():
                 return redirect(request.url)
 
             # Procesar transferencia
-            resultado, mensaje, resumen, archivo_procesado = procesar_transferencia(
-                filepath_origen, filepath_destino, hoja_seleccionada, password
+            formatos = formatos_solicitados()
+            resultado, mensaje, resumen, archivo_procesado = ejecutar_trabajo(
+                'pasar_data', procesar_transferencia,
+                filepath_origen, filepath_destino, hoja_seleccionada, formatos
             )
 
             if resultado:
@@ -165,6 +248,7 @@ def pasar_data():
                                        mensaje=mensaje,
                                        resumen=resumen,
                                        archivo_descarga=archivo_procesado,
+                                       exportaciones=archivos_exportados(archivo_procesado, formatos),
                                        now=datetime.now())
             else:
                 flash(mensaje, 'error')
@@ -173,6 +257,36 @@ def pasar_data():
     return render_template('pasar_data.html')
 
 
+@app.route('/perfiles')
+def perfiles():
+    if 'logged_in' not in session:
+        return redirect(url_for('login'))
+    return render_template('perfiles.html',
+                           perfiles=perfilado.listar_perfiles(),
+                           porcentaje=app.config['PERFILADO_PORCENTAJE'])
+
+
+@app.route('/perfiles/<nombre>')
+def descargar_perfil(nombre):
+    if 'logged_in' not in session:
+        return redirect(url_for('login'))
+    return send_from_directory(os.path.abspath(perfilado.PERFILES_FOLDER), nombre, as_attachment=True)
+
+
+@app.route('/metrics')
+def metrics():
+    return Response(metricas.exportar_prometheus(), mimetype='text/plain; version=0.0.4')
+
+
+@app.after_request
+def contar_solicitud(response):
+    metricas.incrementar('excel_tools_solicitudes_http_total',
+                         endpoint=request.endpoint or 'desconocido',
+                         metodo=request.method,
+                         estado=response.status_code)
+    return response
+
+
 @app.route('/descargar/<filename>')
 def descargar_archivo(filename):
     if 'logged_in' not in session:
@@ -182,6 +296,58 @@ def descargar_archivo(filename):
     return send_file(filepath, as_attachment=True)
 
 
+def ejecutar_trabajo(nombre, funcion, *args):
+    """Ejecuta un procesamiento, perfilándolo si se solicitó con ?perfilar=1 o por muestreo"""
+    solicitado = request.values.get('perfilar') == '1'
+    if perfilado.debe_perfilar(solicitado, app.config['PERFILADO_PORCENTAJE']):
+        return perfilado.ejecutar_con_perfil(nombre, funcion, *args)
+    return funcion(*args)
+
+
+def previsualizar_subida(file, funcion):
+    """Ejecuta una previsualización sobre una copia temporal del archivo subido, sin dejar archivos"""
+    max_filas = request.form.get('max_filas', type=int) or None
+    with tempfile.TemporaryDirectory() as carpeta:
+        filepath = os.path.join(carpeta, secure_filename(file.filename))
+        file.save(filepath)
+        return funcion(filepath, max_filas=max_filas)
+
+
+def valor_json(valor):
+    """Convierte los valores de celda que jsonify no serializa (horas, duraciones, escalares numpy)"""
+    if isinstance(valor, dict):
+        return {clave: valor_json(v) for clave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [valor_json(v) for v in valor]
+    if valor is None or isinstance(valor, (str, bool, int, float, datetime)):
+        return valor
+    if hasattr(valor, 'isoformat'):
+        return valor.isoformat()
+    if hasattr(valor, 'item'):
+        return valor_json(valor.item())
+    return str(valor)
+
+
+def responder_previsualizacion(previsualizacion, volver):
+    """Devuelve la previsualización como JSON (?formato=json) o como página HTML"""
+    if request.args.get('formato') == 'json' or request.accept_mimetypes.best == 'application/json':
+        return jsonify(valor_json(previsualizacion))
+    return render_template('previsualizacion.html',
+                           previsualizacion=previsualizacion,
+                           volver=volver,
+                           now=datetime.now())
+
+
+def formatos_solicitados():
+    """Formatos de exportación adicionales marcados en el formulario"""
+    return [formato for formato in request.form.getlist('formatos') if formato in FORMATOS_EXPORTACION]
+
+
+def hojas_solicitadas():
+    """Hojas indicadas en el formulario (separadas por coma); vacío = todas"""
+    return [hoja.strip() for hoja in request.form.get('hojas', '').split(',') if hoja.strip()]
+
+
 def allowed_file(filename):
     return '.' in filename and \
         filename.rsplit('.', 1)[1].lower() in {'xls', 'xlsx', 'xlsm'}
@@ -194,4 +360,11 @@ def basename_filter(path):
 
 
 if __name__ == '__main__':
-    app.run(debug=True)
+    # Necesario para los procesos de procesar_excel_multihoja en el ejecutable de PyInstaller
+    import multiprocessing
+    multiprocessing.freeze_support()
+
+    # El modo de servidor (desarrollo, waitress o gunicorn) se elige en la sección "servidor" de config.json.
+    # Se pasa esta misma instancia: importar "app" desde servidor ejecutaría este archivo por segunda vez
+    from servidor import main
+    main(app=app)
@@ -6,11 +6,16 @@ a = Analysis(
     pathex=[],
     binaries=[],
     datas=[],
-    hiddenimports=[],
+    hiddenimports=['waitress'],
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    # Submódulos y paquetes que la aplicación no usa: reducen lo que el ejecutable descomprime al iniciar
+    excludes=[
+        'pandas.tests', 'numpy.tests', 'numpy.f2py', 'numpy.distutils',
+        'matplotlib', 'scipy', 'tkinter', 'IPython', 'jedi', 'notebook',
+        'sqlalchemy', 'PIL', 'pytest', 'gunicorn',
+    ],
     noarchive=False,
     optimize=0,
 )
@@ -26,7 +31,8 @@ exe = EXE(
     debug=False,
     bootloader_ignore_signals=False,
     strip=False,
-    upx=True,
+    # UPX obliga a descomprimir cada binario en cada arranque
+    upx=False,
     upx_exclude=[],
     runtime_tmpdir=None,
     console=True,
@@ -0,0 +1,123 @@
+# arranque.py
+#
+# Mide el tiempo de arranque de la aplicación y lo registra en benchmarks/arranque.json:
+#   python -m benchmarks.arranque
+#   python -m benchmarks.arranque --ejecutable dist/app.exe
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from datetime import datetime
+
+HISTORIAL_FILE = os.path.join('benchmarks', 'arranque.json')
+
+# Se ejecuta en un proceso nuevo para medir un arranque en frío del intérprete
+SCRIPT_IMPORTACION = """
+import json, sys, time
+inicio = time.perf_counter()
+import app
+importacion = time.perf_counter() - inicio
+respuesta = app.app.test_client().get('/login')
+primera_respuesta = time.perf_counter() - inicio
+print(json.dumps({
+    'importacion': importacion,
+    'primera_respuesta': primera_respuesta,
+    'estado': respuesta.status_code,
+    'pandas_cargado': 'pandas' in sys.modules,
+    'openpyxl_cargado': 'openpyxl' in sys.modules,
+}))
+"""
+
+
+def medir_importacion() -> dict:
+    """Mide cuánto tarda en importarse app.py y en responder la primera solicitud"""
+    salida = subprocess.run([sys.executable, '-c', SCRIPT_IMPORTACION], capture_output=True, text=True)
+    if salida.returncode != 0:
+        raise RuntimeError(f"Falló la medición de arranque:\n{salida.stderr}")
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def medir_ejecutable(ruta: str, url: str, timeout: float) -> float:
+    """Lanza el ejecutable congelado y mide cuánto tarda en responder por HTTP"""
+    inicio = time.perf_counter()
+    proceso = subprocess.Popen([ruta], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - inicio < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1):
+                    return time.perf_counter() - inicio
+            except OSError:
+                time.sleep(0.1)
+        raise RuntimeError(f"El ejecutable no respondió en {timeout} s")
+    finally:
+        proceso.terminate()
+        try:
+            proceso.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            print("⚠️  El ejecutable no se detuvo con terminate(), se fuerza el cierre")
+            proceso.kill()
+            proceso.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mide el tiempo de arranque de la aplicación")
+    parser.add_argument('--repeticiones', type=int, default=5)
+    parser.add_argument('--ejecutable', help="Ruta al ejecutable generado con PyInstaller")
+    parser.add_argument('--url', default='http://127.0.0.1:5000/login')
+    parser.add_argument('--timeout', type=float, default=60)
+    parser.add_argument('--historial', default=HISTORIAL_FILE)
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help="Aumento relativo permitido respecto a la medición anterior (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    mediciones = [medir_importacion() for _ in range(args.repeticiones)]
+    resultado = {
+        'fecha': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'importacion': statistics.median(m['importacion'] for m in mediciones),
+        'primera_respuesta': statistics.median(m['primera_respuesta'] for m in mediciones),
+        'pandas_cargado': mediciones[-1]['pandas_cargado'],
+        'openpyxl_cargado': mediciones[-1]['openpyxl_cargado'],
+    }
+
+    if args.ejecutable:
+        tiempos = [medir_ejecutable(args.ejecutable, args.url, args.timeout) for _ in range(args.repeticiones)]
+        resultado['ejecutable'] = statistics.median(tiempos)
+
+    print(f"⏱️  Importación de app: {resultado['importacion']:.2f} s")
+    print(f"⏱️  Primera respuesta: {resultado['primera_respuesta']:.2f} s")
+    if resultado['pandas_cargado'] or resultado['openpyxl_cargado']:
+        print("⚠️  pandas/openpyxl se cargan al arrancar; deberían importarse de forma diferida")
+    if 'ejecutable' in resultado:
+        print(f"⏱️  Ejecutable hasta responder: {resultado['ejecutable']:.2f} s")
+
+    historial = []
+    if os.path.exists(args.historial):
+        with open(args.historial, encoding='utf-8') as f:
+            historial = json.load(f)
+
+    codigo = 0
+    if historial:
+        anterior = historial[-1]
+        for metrica in ('importacion', 'primera_respuesta', 'ejecutable'):
+            if metrica in resultado and anterior.get(metrica):
+                ratio = resultado[metrica] / anterior[metrica]
+                if ratio > 1 + args.tolerancia:
+                    print(f"❌ Regresión en {metrica}: {anterior[metrica]:.2f} → {resultado[metrica]:.2f} s")
+                    codigo = 1
+
+    historial.append(resultado)
+    with open(args.historial, 'w', encoding='utf-8') as f:
+        json.dump(historial, f, indent=2)
+    print(f"💾 Medición agregada a {args.historial}")
+
+    return codigo
+
+
+if __name__ == "__main__":
+    sys.exit(main())
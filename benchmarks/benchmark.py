@@ -0,0 +1,160 @@
+# benchmark.py
+#
+# Mide tiempo total y memoria pico de cada pipeline sobre libros sintéticos:
+#   python -m benchmarks.benchmark                      # compara contra benchmarks/baseline.json
+#   python -m benchmarks.benchmark --guardar-baseline   # registra un nuevo baseline
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from benchmarks.generar_libros import obtener_libros
+
+TAMANOS = [1000, 10000, 100000, 500000]
+PIPELINES = ['insertar_columna', 'pasar_data']
+BASELINE_FILE = os.path.join('benchmarks', 'baseline.json')
+DATOS_FOLDER = os.path.join('benchmarks', 'datos')
+
+
+def rss_pico_mb():
+    """Memoria residente pico del proceso actual en MB (None si no está disponible)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reporta KB, macOS bytes
+    if sys.platform == 'darwin':
+        return pico / (1024 * 1024)
+    return pico / 1024
+
+
+def ejecutar_pipeline(pipeline: str, rutas: dict) -> dict:
+    """Ejecuta un pipeline sobre copias temporales de los libros y mide su duración"""
+    with tempfile.TemporaryDirectory() as tmp:
+        if pipeline == 'insertar_columna':
+            from modules.insertar_columna import procesar_excel
+
+            origen = shutil.copy(rutas['mayor'], tmp)
+            inicio = time.perf_counter()
+            exito, _, _ = procesar_excel(origen)
+            segundos = time.perf_counter() - inicio
+
+        elif pipeline == 'pasar_data':
+            from modules import pasar_data
+
+            origen = shutil.copy(rutas['analisis'], tmp)
+            destino = shutil.copy(rutas['bd6'], tmp)
+            hoja = pasar_data.obtener_hojas_analisis(origen)[0]
+            inicio = time.perf_counter()
+            exito, _, _, _ = pasar_data.procesar_transferencia(origen, destino, hoja)
+            segundos = time.perf_counter() - inicio
+
+        else:
+            raise ValueError(f"Pipeline desconocido: {pipeline}")
+
+    return {'exito': exito, 'segundos': segundos, 'rss_pico_mb': rss_pico_mb()}
+
+
+def medir_en_subproceso(pipeline: str, rutas: dict) -> dict:
+    """Mide un pipeline en un proceso nuevo para que la memoria pico sea independiente"""
+    comando = [sys.executable, '-m', 'benchmarks.benchmark', '--ejecutar', pipeline, json.dumps(rutas)]
+    salida = subprocess.run(comando, capture_output=True, text=True, encoding='utf-8')
+    if salida.returncode != 0:
+        raise RuntimeError(f"Falló la medición de {pipeline}:\n{salida.stderr}")
+
+    # Los pipelines imprimen su progreso; el resultado es la última línea
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def comparar_con_baseline(resultados: dict, baseline: dict, tolerancia: float) -> list:
+    """Devuelve la lista de regresiones respecto al baseline"""
+    regresiones = []
+    for pipeline, por_tamano in resultados.items():
+        for tamano, actual in por_tamano.items():
+            if not actual['exito']:
+                regresiones.append(f"{pipeline} {tamano} filas: el procesamiento falló")
+                continue
+
+            anterior = baseline.get('resultados', {}).get(pipeline, {}).get(tamano)
+            if not anterior:
+                continue
+
+            for metrica in ('segundos', 'rss_pico_mb'):
+                if actual.get(metrica) is None or not anterior.get(metrica):
+                    continue
+                ratio = actual[metrica] / anterior[metrica]
+                if ratio > 1 + tolerancia:
+                    regresiones.append(
+                        f"{pipeline} {tamano} filas: {metrica} {anterior[metrica]:.2f} → "
+                        f"{actual[metrica]:.2f} ({(ratio - 1) * 100:+.0f}%)"
+                    )
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los pipelines de Excel")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS)
+    parser.add_argument('--pipelines', nargs='+', choices=PIPELINES, default=PIPELINES)
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--directorio', default=DATOS_FOLDER)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--guardar-baseline', action='store_true')
+    parser.add_argument('--tolerancia', type=float, default=0.2,
+                        help="Aumento relativo permitido antes de marcar una regresión (0.2 = 20%%)")
+    parser.add_argument('--ejecutar', nargs=2, metavar=('PIPELINE', 'RUTAS_JSON'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.ejecutar:
+        pipeline, rutas = args.ejecutar
+        print(json.dumps(ejecutar_pipeline(pipeline, json.loads(rutas))))
+        return 0
+
+    resultados = {pipeline: {} for pipeline in args.pipelines}
+    for tamano in args.tamanos:
+        rutas = obtener_libros(args.directorio, tamano, args.semilla)
+        for pipeline in args.pipelines:
+            medicion = medir_en_subproceso(pipeline, rutas)
+            resultados[pipeline][str(tamano)] = medicion
+            rss = f"{medicion['rss_pico_mb']:.1f} MB" if medicion['rss_pico_mb'] is not None else 'n/d'
+            estado = '✅' if medicion['exito'] else '❌'
+            print(f"{estado} {pipeline:<17} {tamano:>7} filas: {medicion['segundos']:8.2f} s, RSS pico {rss}")
+
+    if args.guardar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generado': datetime.now().isoformat(timespec='seconds'),
+                'python': platform.python_version(),
+                'plataforma': platform.platform(),
+                'resultados': resultados,
+            }, f, indent=2)
+        print(f"💾 Baseline guardado en {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("⚠️  No hay baseline para comparar; ejecute con --guardar-baseline")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as f:
+        baseline = json.load(f)
+
+    regresiones = comparar_con_baseline(resultados, baseline, args.tolerancia)
+    if regresiones:
+        print("❌ Regresiones detectadas:")
+        for regresion in regresiones:
+            print(f"   {regresion}")
+        return 1
+
+    print("✅ Sin regresiones respecto al baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
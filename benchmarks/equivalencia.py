@@ -0,0 +1,215 @@
+# equivalencia.py
+#
+# Compara la salida de dos motores de procesamiento celda por celda:
+#   python -m benchmarks.equivalencia --pipeline insertar_columna --motor-b paquete.modulo:funcion
+#   python -m benchmarks.equivalencia --pipeline pasar_data --corpus origen.xlsx,destino.xlsx
+#
+# Un motor es cualquier función con la misma firma que procesar_excel / procesar_transferencia.
+import argparse
+import importlib
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from itertools import zip_longest
+
+from openpyxl import load_workbook
+from openpyxl.utils import get_column_letter
+
+from benchmarks.generar_libros import obtener_libros
+
+MOTORES_REFERENCIA = {
+    'insertar_columna': 'modules.insertar_columna:procesar_excel',
+    'pasar_data': 'modules.pasar_data:procesar_transferencia',
+}
+
+LADOS_BORDE = ('left', 'right', 'top', 'bottom')
+
+
+def cargar_motor(especificacion: str):
+    """Importa un motor a partir de una especificación "modulo:funcion" """
+    nombre_modulo, _, nombre_funcion = especificacion.partition(':')
+    if not nombre_funcion:
+        raise ValueError(f"Motor inválido (se espera modulo:funcion): {especificacion}")
+    return getattr(importlib.import_module(nombre_modulo), nombre_funcion)
+
+
+def ejecutar_motor(pipeline: str, motor, archivos: tuple, directorio: str):
+    """Ejecuta un motor sobre copias de los archivos y devuelve (ruta de salida, segundos)"""
+    copias = [shutil.copy(archivo, directorio) for archivo in archivos]
+
+    if pipeline == 'insertar_columna':
+        inicio = time.perf_counter()
+        exito, nombre_salida, _ = motor(copias[0])
+        segundos = time.perf_counter() - inicio
+        ruta_salida = os.path.join(directorio, nombre_salida) if exito else None
+    else:
+        from modules import pasar_data
+
+        origen, destino = copias
+        hoja = pasar_data.obtener_hojas_analisis(origen)[0]
+        inicio = time.perf_counter()
+        exito, mensaje, _, ruta_salida = motor(origen, destino, hoja)
+        segundos = time.perf_counter() - inicio
+
+    if not exito:
+        raise RuntimeError(f"El motor {motor.__module__}.{motor.__name__} falló sobre {archivos}")
+
+    return ruta_salida, segundos
+
+
+def medir_motores(pipeline: str, motores: list, archivos: tuple, repeticiones: int) -> list:
+    """Mediana de segundos de cada motor, alternando el orden de ejecución en cada ronda"""
+    tiempos = [[] for _ in motores]
+    for ronda in range(repeticiones):
+        orden = range(len(motores)) if ronda % 2 == 0 else reversed(range(len(motores)))
+        for i in orden:
+            with tempfile.TemporaryDirectory() as directorio:
+                _, segundos = ejecutar_motor(pipeline, motores[i], archivos, directorio)
+            tiempos[i].append(segundos)
+    return [statistics.median(t) for t in tiempos]
+
+
+def describir_celda(cell) -> dict:
+    """Extrae los atributos de una celda que deben coincidir entre motores"""
+    border = getattr(cell, 'border', None)
+    font = getattr(cell, 'font', None)
+    return {
+        'valor': getattr(cell, 'value', None),
+        'formato': getattr(cell, 'number_format', None) or 'General',
+        'bordes': tuple(getattr(getattr(border, lado, None), 'style', None) for lado in LADOS_BORDE),
+        'negrita': bool(font is not None and font.b),
+    }
+
+
+def valores_iguales(a, b) -> bool:
+    """Compara dos valores de celda, tolerando diferencias de redondeo en flotantes"""
+    if isinstance(a, float) and isinstance(b, float):
+        return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-12)
+    return a == b and type(a) is type(b)
+
+
+def comparar_hojas(hoja_a, hoja_b, max_diferencias: int) -> list:
+    """Compara dos hojas celda por celda y devuelve las primeras diferencias"""
+    # En modo solo lectura max_row/max_column salen de la etiqueta <dimension>, que un motor puede dejar
+    # desactualizada u omitir: se recorre el contenido real y la etiqueta se compara aparte
+    declaradas = [(hoja.max_row, hoja.max_column) for hoja in (hoja_a, hoja_b)]
+    for hoja in (hoja_a, hoja_b):
+        hoja.reset_dimensions()
+
+    diferencias = []
+    reales = [[0, 0], [0, 0]]
+    filas = zip_longest(hoja_a.iter_rows(), hoja_b.iter_rows(), fillvalue=())
+    for num_fila, (fila_a, fila_b) in enumerate(filas, 1):
+        for real, fila in zip(reales, (fila_a, fila_b)):
+            if fila:
+                real[0] = num_fila
+                real[1] = max(real[1], len(fila))
+
+        if len(diferencias) >= max_diferencias:
+            continue
+
+        for num_columna, (celda_a, celda_b) in enumerate(zip_longest(fila_a, fila_b), 1):
+            desc_a = describir_celda(celda_a)
+            desc_b = describir_celda(celda_b)
+            for atributo in desc_a:
+                if atributo == 'valor':
+                    iguales = valores_iguales(desc_a['valor'], desc_b['valor'])
+                else:
+                    iguales = desc_a[atributo] == desc_b[atributo]
+
+                if not iguales and len(diferencias) < max_diferencias:
+                    diferencias.append(
+                        f"{hoja_a.title}!{get_column_letter(num_columna)}{num_fila} {atributo}: "
+                        f"{desc_a[atributo]!r} ≠ {desc_b[atributo]!r}"
+                    )
+
+    for motor, declarada, real in zip('AB', declaradas, reales):
+        if declarada != tuple(real):
+            diferencias.append(f"{hoja_a.title} dimensión declarada en {motor}: {declarada} filas/columnas, "
+                               f"contenido: {tuple(real)}")
+    return diferencias
+
+
+def comparar_libros(ruta_a: str, ruta_b: str, max_diferencias: int = 20) -> list:
+    """Compara semánticamente dos libros y devuelve las primeras diferencias encontradas"""
+    wb_a = load_workbook(ruta_a, read_only=True)
+    wb_b = load_workbook(ruta_b, read_only=True)
+    try:
+        if wb_a.sheetnames != wb_b.sheetnames:
+            return [f"Hojas distintas: {wb_a.sheetnames} ≠ {wb_b.sheetnames}"]
+
+        diferencias = []
+        for nombre in wb_a.sheetnames:
+            diferencias += comparar_hojas(wb_a[nombre], wb_b[nombre], max_diferencias - len(diferencias))
+            if len(diferencias) >= max_diferencias:
+                break
+        return diferencias
+    finally:
+        wb_a.close()
+        wb_b.close()
+
+
+def construir_corpus(pipeline: str, corpus: list, tamanos: list, directorio: str) -> list:
+    """Devuelve la lista de entradas a comparar (tuplas de archivos)"""
+    if corpus:
+        return [tuple(entrada.split(',')) for entrada in corpus]
+
+    entradas = []
+    for tamano in tamanos:
+        rutas = obtener_libros(directorio, tamano)
+        if pipeline == 'insertar_columna':
+            entradas.append((rutas['mayor'],))
+        else:
+            entradas.append((rutas['analisis'], rutas['bd6']))
+    return entradas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica que dos motores produzcan libros equivalentes")
+    parser.add_argument('--pipeline', choices=list(MOTORES_REFERENCIA), required=True)
+    parser.add_argument('--motor-a', help="Motor de referencia (modulo:funcion)")
+    parser.add_argument('--motor-b', help="Motor a validar (modulo:funcion)")
+    parser.add_argument('--corpus', nargs='+',
+                        help="Archivos de entrada; para pasar_data use pares origen.xlsx,destino.xlsx")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--directorio', default=os.path.join('benchmarks', 'datos'))
+    parser.add_argument('--max-diferencias', type=int, default=20)
+    parser.add_argument('--repeticiones', type=int, default=3,
+                        help="Ejecuciones cronometradas de cada motor (se informa la mediana)")
+    args = parser.parse_args()
+
+    motor_a = cargar_motor(args.motor_a or MOTORES_REFERENCIA[args.pipeline])
+    motor_b = cargar_motor(args.motor_b or MOTORES_REFERENCIA[args.pipeline])
+
+    todo_igual = True
+    for archivos in construir_corpus(args.pipeline, args.corpus, args.tamanos, args.directorio):
+        # La primera ejecución de cada motor solo se compara: también sirve de calentamiento
+        # (primeras importaciones, caché de archivos) y no se cronometra
+        with tempfile.TemporaryDirectory() as dir_a, tempfile.TemporaryDirectory() as dir_b:
+            salida_a, _ = ejecutar_motor(args.pipeline, motor_a, archivos, dir_a)
+            salida_b, _ = ejecutar_motor(args.pipeline, motor_b, archivos, dir_b)
+            diferencias = comparar_libros(salida_a, salida_b, args.max_diferencias)
+
+        nombre = os.path.basename(archivos[0])
+        estado = '✅' if not diferencias else '❌'
+        if args.repeticiones > 0:
+            segundos_a, segundos_b = medir_motores(args.pipeline, [motor_a, motor_b], archivos, args.repeticiones)
+            ratio = segundos_a / segundos_b if segundos_b else float('inf')
+            print(f"{estado} {nombre}: A {segundos_a:.2f} s, B {segundos_b:.2f} s "
+                  f"(mediana de {args.repeticiones}, B es {ratio:.2f}x)")
+        else:
+            print(f"{estado} {nombre}")
+        for diferencia in diferencias:
+            print(f"   {diferencia}")
+
+        todo_igual = todo_igual and not diferencias
+
+    return 0 if todo_igual else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+# generar_libros.py
+#
+# Generador de libros Excel sintéticos para los benchmarks:
+#   python -m benchmarks.generar_libros --filas 10000 --directorio benchmarks/datos
+import argparse
+import os
+import random
+from datetime import datetime, timedelta
+from openpyxl import Workbook
+
+CABECERAS_ANALISIS = [
+    "Cta", "Nro", "Suc - Tipo - Nro", "Fecha", "Org.",
+    "Nro CPago - Tipo/Serie/ Numero/Fecha de Emision", "Glosa / Proveedor", "CC", "Debe"
+]
+
+CABECERAS_BD6 = [
+    "AÑO", "MES", "CTA", "DESCRIPCION", "Suc - Tipo - Nro", "FECHA",
+    "ORG", "CPAGO", "Glosa / Proveedor", "CC", "META", "Debe"
+]
+
+DESCRIPCIONES_CUENTA = [
+    "REMUNERACIONES", "BIENES DE CONSUMO", "SERVICIOS BASICOS", "ALQUILERES",
+    "VIATICOS", "MANTENIMIENTO", "SEGUROS", "CONSULTORIAS", "MOBILIARIO"
+]
+
+GLOSAS = [
+    "PAGO PERSONAL ESTABLE -", "PAGO PERSONAL CONTRATADO -", "PROVEEDOR 20530 -",
+    "COMPRA DE UTILES DE OFICINA", "SERVICIO DE LIMPIEZA -", "ENERGIA ELECTRICA",
+    "AGUA POTABLE", "SERVICIO DE INTERNET - ", "REPUESTOS VEHICULARES"
+]
+
+FECHA_INICIO = datetime(2024, 1, 1)
+
+
+def fecha_mixta(rnd: random.Random):
+    """Devuelve una fecha en uno de los formatos que aparecen en los libros reales"""
+    fecha = FECHA_INICIO + timedelta(days=rnd.randint(0, 364))
+    formato = rnd.randint(0, 7)
+
+    if formato == 0:
+        return fecha.strftime('%d/%m/%Y')
+    if formato == 1:
+        return fecha.strftime('%d-%m-%y')
+    if formato == 2:
+        return fecha.strftime('%d.%m.%Y')
+    if formato == 3:
+        return fecha.strftime('%Y-%m-%d')
+    if formato == 4:
+        # Número de serie de Excel
+        return float((fecha - datetime(1899, 12, 30)).days)
+    if formato == 5:
+        # Fecha inválida: la fila se descarta en el filtro de fechas
+        return 'S/F'
+    return fecha
+
+
+def generar_libro_mayor(ruta: str, filas: int, semilla: int = 0) -> str:
+    """Genera un libro mayor con cabeceras de cuenta "6xxx" para insertar_columna"""
+    rnd = random.Random(semilla)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Mayor')
+
+    # Filas de título (1-5) y cabecera original (6)
+    ws.append(['EMPRESA DEMO S.A.'])
+    ws.append(['LIBRO MAYOR ANALITICO'])
+    ws.append(['Periodo: 01/01/2024 - 31/12/2024'])
+    ws.append([])
+    ws.append([])
+    ws.append(['Nro', 'Suc - Tipo - Nro', 'Fecha', 'Org.', 'Nro CPago', 'Glosa', 'CC', 'Debe', 'Haber',
+               'Saldo', 'Moneda', 'Usuario'])
+
+    generadas = 0
+    while generadas < filas:
+        cuenta = f"6{rnd.randint(10000, 99999)} {rnd.choice(DESCRIPCIONES_CUENTA)}"
+        ws.append([cuenta])
+        generadas += 1
+
+        movimientos = min(rnd.randint(5, 40), filas - generadas)
+        for _ in range(movimientos):
+            debe = round(rnd.uniform(10, 50000), 2)
+            haber = round(rnd.uniform(0, 1000), 2) if rnd.random() < 0.2 else None
+            ws.append([
+                rnd.randint(1, 99999),
+                f"{rnd.randint(1, 9):03d} - RC - {rnd.randint(1, 999999):06d}",
+                fecha_mixta(rnd),
+                rnd.choice(['00', '01', '13']),
+                f"01/F001/{rnd.randint(1, 99999):08d}",
+                rnd.choice(GLOSAS),
+                f"CC{rnd.randint(1, 40):03d}",
+                debe,
+                haber,
+                round(debe - (haber or 0), 2),
+                'PEN',
+                f"usuario{rnd.randint(1, 9)}",
+            ])
+        generadas += movimientos
+
+    wb.save(ruta)
+    return ruta
+
+
+def generar_analisis(ruta: str, filas: int, semilla: int = 0) -> str:
+    """Genera un archivo origen con una hoja "Analisis" para pasar_data"""
+    rnd = random.Random(semilla)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('Analisis 2024')
+
+    for _ in range(5):
+        ws.append([])
+    ws.append(CABECERAS_ANALISIS)
+
+    cuenta = None
+    for i in range(filas):
+        if cuenta is None or rnd.random() < 0.05:
+            cuenta = f"6{rnd.randint(10000, 99999)} {rnd.choice(DESCRIPCIONES_CUENTA)}"
+
+        fecha = FECHA_INICIO + timedelta(days=rnd.randint(0, 364))
+        debe = round(rnd.uniform(10, 50000), 2)
+        ws.append([
+            cuenta,
+            rnd.randint(1, 99999),
+            f"{rnd.randint(1, 9):03d} - RC - {rnd.randint(1, 999999):06d}",
+            fecha if rnd.random() < 0.7 else fecha.strftime('%d/%m/%Y'),
+            rnd.choice(['00', '01', '13']),
+            f"01/F001/{rnd.randint(1, 99999):08d}",
+            rnd.choice(GLOSAS),
+            f"CC{rnd.randint(1, 40):03d}",
+            debe if rnd.random() < 0.9 else f"S/ {debe:,.2f}",
+        ])
+
+    wb.save(ruta)
+    return ruta
+
+
+def generar_bd6(ruta: str, filas: int, semilla: int = 0) -> str:
+    """Genera un archivo destino con la hoja "BD6" y datos previos a sobrescribir"""
+    rnd = random.Random(semilla)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet('BD6')
+
+    for _ in range(4):
+        ws.append([])
+    ws.append(CABECERAS_BD6)
+
+    for _ in range(filas // 2):
+        ws.append([2023, rnd.randint(1, 12), None, None, 'ANTERIOR', FECHA_INICIO, '00', None,
+                   'DATO ANTERIOR', 'CC000', rnd.randint(1, 20), round(rnd.uniform(10, 1000), 2)])
+
+    wb.save(ruta)
+    return ruta
+
+
+def obtener_libros(directorio: str, filas: int, semilla: int = 0) -> dict:
+    """Devuelve las rutas de los libros sintéticos de un tamaño, generándolos si no existen"""
+    os.makedirs(directorio, exist_ok=True)
+    generadores = {
+        'mayor': generar_libro_mayor,
+        'analisis': generar_analisis,
+        'bd6': generar_bd6,
+    }
+
+    rutas = {}
+    for tipo, generador in generadores.items():
+        ruta = os.path.join(directorio, f"{tipo}_{filas}_{semilla}.xlsx")
+        if not os.path.exists(ruta):
+            print(f"🛠️  Generando {os.path.basename(ruta)}...")
+            generador(ruta, filas, semilla)
+        rutas[tipo] = ruta
+
+    return rutas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Genera libros Excel sintéticos para benchmarks")
+    parser.add_argument('--filas', type=int, nargs='+', default=[1000])
+    parser.add_argument('--semilla', type=int, default=0)
+    parser.add_argument('--directorio', default=os.path.join('benchmarks', 'datos'))
+    args = parser.parse_args()
+
+    for n in args.filas:
+        for ruta in obtener_libros(args.directorio, n, args.semilla).values():
+            print(f"✅ {ruta}")
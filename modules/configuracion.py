@@ -0,0 +1,97 @@
+# configuracion.py
+import copy
+import hashlib
+import hmac
+import json
+import os
+import stat
+import tempfile
+import threading
+
+CONFIG_FILE = "config.json"
+PASSWORD_HASH = "c8a6ed3ac08087cc037c2fc7846a7f95976b8f5bfbaf2d9540cf89b74452b034"
+
+# Caché del archivo de configuración, validada por inodo, mtime y tamaño
+_lock = threading.Lock()
+_cache = {"firma": None, "config": None}
+
+
+def _configuracion_por_defecto():
+    """Configuración usada cuando config.json no existe o está dañado"""
+    return {"password_hash": PASSWORD_HASH}
+
+
+def _firma_archivo():
+    """Identifica la versión del archivo en disco sin leerlo"""
+    try:
+        estado = os.stat(CONFIG_FILE)
+    except FileNotFoundError:
+        return None
+    # guardar_configuracion reemplaza el archivo (inodo nuevo) aunque el tamaño y el mtime no cambien
+    return estado.st_ino, estado.st_mtime_ns, estado.st_size
+
+
+def cargar_configuracion():
+    """Devuelve la configuración; config.json solo se vuelve a leer si cambió en disco"""
+    firma = _firma_archivo()
+    if firma is None:
+        return _configuracion_por_defecto()
+
+    with _lock:
+        if _cache["firma"] != firma:
+            try:
+                with open(CONFIG_FILE, 'r') as f:
+                    config = json.load(f)
+            except (OSError, ValueError):
+                config = _configuracion_por_defecto()
+            _cache["firma"] = firma
+            _cache["config"] = config
+
+        # Copia para que quien la modifique no altere la caché
+        return copy.deepcopy(_cache["config"])
+
+
+def _modo_archivo():
+    """Permisos de config.json actual; si no existe, los de un archivo nuevo (0666 menos la umask)"""
+    try:
+        return stat.S_IMODE(os.stat(CONFIG_FILE).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def guardar_configuracion(config):
+    """Guarda la configuración de forma atómica (archivo temporal + rename)"""
+    directorio = os.path.dirname(os.path.abspath(CONFIG_FILE))
+    descriptor, ruta_temporal = tempfile.mkstemp(dir=directorio, prefix='.config_', suffix='.tmp')
+    try:
+        with os.fdopen(descriptor, 'w') as f:
+            json.dump(config, f)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp crea el temporal con 0600; se conservan los permisos que tenía config.json
+        os.chmod(ruta_temporal, _modo_archivo())
+        os.replace(ruta_temporal, CONFIG_FILE)
+    except Exception:
+        if os.path.exists(ruta_temporal):
+            os.remove(ruta_temporal)
+        raise
+
+    with _lock:
+        _cache["firma"] = _firma_archivo()
+        _cache["config"] = copy.deepcopy(config)
+
+
+def hash_password(password):
+    """Genera el hash de una contraseña"""
+    return hashlib.sha256(password.encode()).hexdigest()
+
+
+def verificar_password(password):
+    """Verifica la contraseña contra el hash almacenado"""
+    if not password:
+        return False
+
+    password_hash_almacenado = cargar_configuracion().get("password_hash", PASSWORD_HASH)
+    return hmac.compare_digest(hash_password(password), password_hash_almacenado)
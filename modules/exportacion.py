@@ -0,0 +1,126 @@
+# exportacion.py
+import csv
+import os
+import re
+from datetime import date, datetime
+from typing import List, Sequence
+
+FORMATOS_EXPORTACION = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'arrow': '.arrow',
+}
+
+
+def ruta_exportacion(ruta_xlsx: str, formato: str) -> str:
+    """Ruta del archivo exportado que acompaña a un xlsx procesado"""
+    return os.path.splitext(ruta_xlsx)[0] + FORMATOS_EXPORTACION[formato]
+
+
+def ruta_hoja(ruta_xlsx: str, hoja: str) -> str:
+    """Ruta base de las exportaciones de una hoja de un libro procesado con varias hojas"""
+    nombre_hoja = re.sub(r'[^\w\-]+', '_', hoja).strip('_') or 'hoja'
+    return f"{os.path.splitext(ruta_xlsx)[0]}_{nombre_hoja}.xlsx"
+
+
+def archivos_exportados(ruta_xlsx: str, formatos: Sequence[str]) -> List[str]:
+    """Nombres de los archivos exportados que existen junto al xlsx procesado"""
+    nombres = []
+    for formato in formatos:
+        if formato in FORMATOS_EXPORTACION:
+            ruta = ruta_exportacion(ruta_xlsx, formato)
+            if os.path.exists(ruta):
+                nombres.append(os.path.basename(ruta))
+    return nombres
+
+
+def nombres_columnas(cabeceras: Sequence) -> List[str]:
+    """Asegura nombres de columna no vacíos y únicos"""
+    nombres = []
+    for i, cabecera in enumerate(cabeceras, 1):
+        nombre = str(cabecera).strip() if cabecera not in (None, '') else f"Columna {i}"
+        while nombre in nombres:
+            nombre = f"{nombre}_{i}"
+        nombres.append(nombre)
+    return nombres
+
+
+def exportar_csv(ruta: str, cabeceras: Sequence, filas):
+    """Escribe la tabla como CSV fila por fila, sin materializarla"""
+    with open(ruta, 'w', newline='', encoding='utf-8') as f:
+        escritor = csv.writer(f)
+        escritor.writerow(nombres_columnas(cabeceras))
+        for fila in filas:
+            escritor.writerow(['' if valor is None else valor for valor in fila])
+
+
+def _columna_arrow(valores: list):
+    """Convierte una columna a arreglo Arrow; las columnas con tipos mezclados pasan a texto"""
+    import pyarrow as pa
+
+    valores = [None if isinstance(v, float) and v != v else v for v in valores]
+    try:
+        return pa.array(valores)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        return pa.array([None if v is None else str(v) for v in valores], type=pa.string())
+
+
+def tabla_arrow(cabeceras: Sequence, filas: list):
+    """Construye una tabla Arrow en memoria a partir de las filas procesadas"""
+    import pyarrow as pa
+
+    nombres = nombres_columnas(cabeceras)
+    columnas = list(zip(*filas)) if filas else [()] * len(nombres)
+    arreglos = []
+    for i in range(len(nombres)):
+        valores = list(columnas[i]) if i < len(columnas) else [None] * len(filas)
+        valores = [datetime(v.year, v.month, v.day) if isinstance(v, date) and not isinstance(v, datetime)
+                   else v for v in valores]
+        arreglos.append(_columna_arrow(valores))
+    return pa.Table.from_arrays(arreglos, names=nombres)
+
+
+def exportar_tabla(ruta_xlsx: str, cabeceras: Sequence, filas: list, formatos: Sequence[str]) -> List[str]:
+    """Exporta la tabla a los formatos pedidos junto al xlsx; los formatos que fallan se omiten"""
+    generados = []
+    tabla = None
+
+    for formato in formatos:
+        if formato not in FORMATOS_EXPORTACION:
+            continue
+
+        ruta = ruta_exportacion(ruta_xlsx, formato)
+        # Evita ofrecer para descarga una exportación anterior si esta falla
+        if os.path.exists(ruta):
+            os.remove(ruta)
+
+        try:
+            if formato == 'csv':
+                exportar_csv(ruta, cabeceras, filas)
+            else:
+                if tabla is None:
+                    tabla = tabla_arrow(cabeceras, filas)
+
+                if formato == 'parquet':
+                    import pyarrow.parquet as pq
+                    pq.write_table(tabla, ruta)
+                else:
+                    import pyarrow as pa
+                    with pa.OSFile(ruta, 'wb') as sink:
+                        with pa.ipc.new_file(sink, tabla.schema) as escritor:
+                            escritor.write_table(tabla)
+
+            generados.append(os.path.basename(ruta))
+            print(f"💾 Exportado como: {os.path.basename(ruta)}")
+
+        except ImportError:
+            # Parquet y Arrow requieren pyarrow
+            print(f"⚠️  pyarrow no está instalado, se omite la exportación {formato}")
+
+        except Exception as e:
+            # Las exportaciones son opcionales: un fallo no invalida el xlsx ya guardado
+            print(f"⚠️  Error al exportar {formato} ({str(e)}), se omite")
+            if os.path.exists(ruta):
+                os.remove(ruta)
+
+    return generados
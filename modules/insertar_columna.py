@@ -1,12 +1,38 @@
 # insertar_columna.py
 import os
 import re
-from datetime import datetime
-from openpyxl import load_workbook
+import heapq
+import multiprocessing
+import threading
+import time
+from datetime import datetime, timedelta
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from openpyxl import Workbook, load_workbook
 from openpyxl.utils import get_column_letter
 from openpyxl.styles import Font, PatternFill, Border, Alignment, Protection, Side
-import pandas as pd
 from typing import List, Tuple, Optional, Union
+from modules import metricas
+from modules.lectores import cargar_libro, leer_filas, listar_hojas, nombre_hoja_activa
+from modules.exportacion import exportar_tabla, ruta_hoja
+
+PIPELINE = 'insertar_columna'
+
+_pool_hojas = None
+_lock_pool = threading.Lock()
+
+# Cabeceras que se escriben en la fila 6 de la tabla procesada
+CABECERAS = {
+    1: "Cta",
+    2: "Nro",
+    3: "Suc - Tipo - Nro",
+    4: "Fecha",
+    5: "Org.",
+    6: "Nro CPago - Tipo/Serie/ Numero/Fecha de Emision",
+    7: "Glosa / Proveedor",
+    8: "CC",
+    9: "Debe"
+}
 
 
 def crear_borde_estilo(grosor: str = 'thin') -> Border:
@@ -155,13 +181,31 @@ def convertir_a_fecha_dd_mm_yyyy(valor) -> Union[datetime, None]:
         try:
             if valor >= 1:
                 fecha_base = datetime(1899, 12, 30)
-                return fecha_base + pd.Timedelta(days=valor)
+                return fecha_base + timedelta(days=valor)
         except:
             pass
 
     return None
 
 
+def es_cabecera_cuenta(valor) -> bool:
+    """Indica si el valor es una cabecera de cuenta: comienza con "6" y tiene más de 2 dígitos"""
+    if valor and isinstance(valor, str):
+        valor = valor.strip()
+        if valor.startswith('6'):
+            match = re.match(r'^(\d+)', valor)
+            return bool(match and len(match.group(1)) > 2)
+    return False
+
+
+def a_numero(valor) -> float:
+    """Convierte un valor de celda a número; vacíos y textos no numéricos cuentan como 0"""
+    try:
+        return float(valor) if valor not in [None, ''] else 0
+    except (ValueError, TypeError):
+        return 0
+
+
 def formatear_fecha_dd_mm_yyyy(fecha: datetime) -> str:
     """Formatea datetime a string dd/mm/yyyy"""
     return fecha.strftime('%d/%m/%Y')
@@ -178,190 +222,186 @@ def aplicar_formato_fecha_excel(sheet, columna: int, desde_fila: int):
             pass
 
 
-def procesar_excel(file_path: str) -> Tuple[bool, Optional[str], int]:
-    """Función para procesar el archivo Excel con bordes y formato profesional"""
+def procesar_excel(file_path: str, formatos_exportacion: Optional[List[str]] = None) -> Tuple[bool, Optional[str], int]:
+    """Función para procesar el archivo Excel con bordes y formato profesional (y exportarlo a CSV/Parquet/Arrow)"""
+    inicio = time.perf_counter()
     try:
+        metricas.incrementar('excel_tools_bytes_entrada_total', os.path.getsize(file_path), pipeline=PIPELINE)
+
         # Cargar el workbook
-        wb = load_workbook(filename=file_path, data_only=True)
-        sheet = wb.active
+        with metricas.medir_etapa(PIPELINE, 'carga'):
+            wb = cargar_libro(file_path)
+            sheet = wb.active
 
         # 1. ELIMINAR FORMATOS primero para evitar errores
-        eliminar_formatos(sheet)
-        print("✅ Formatos eliminados")
+        with metricas.medir_etapa(PIPELINE, 'eliminar_formatos'):
+            eliminar_formatos(sheet)
+            print("✅ Formatos eliminados")
 
-        # 2. Insertar una columna en la posición A
-        sheet.insert_cols(1)
-        print("✅ Columna A insertada")
+            # 2. Insertar una columna en la posición A
+            sheet.insert_cols(1)
+            print("✅ Columna A insertada")
 
-        # Encontrar la última fila y columna con datos reales
-        last_row = 0
-        last_column = 0
+        with metricas.medir_etapa(PIPELINE, 'escaneo_patrones'):
+            # Encontrar la última fila y columna con datos reales
+            last_row = 0
+            last_column = 0
 
-        for row in sheet.iter_rows():
-            for cell in row:
-                if cell.value is not None:
-                    last_row = max(last_row, cell.row)
-                    last_column = max(last_column, cell.column)
+            for row in sheet.iter_rows():
+                for cell in row:
+                    if cell.value is not None:
+                        last_row = max(last_row, cell.row)
+                        last_column = max(last_column, cell.column)
 
-        print(f"📊 Filas: {last_row}, Columnas: {last_column}")
+            print(f"📊 Filas: {last_row}, Columnas: {last_column}")
 
-        # 3. Encontrar filas que comienzan con "6" y tienen más de 2 dígitos
-        pattern_rows = []
-        for row in range(1, last_row + 1):
-            cell_value = sheet.cell(row=row, column=2).value
-            if cell_value and isinstance(cell_value, str):
-                cell_value = str(cell_value).strip()
-                if cell_value.startswith('6'):
-                    match = re.match(r'^(\d+)', cell_value)
-                    if match and len(match.group(1)) > 2:
-                        pattern_rows.append(row)
+            # 3. Encontrar filas que comienzan con "6" y tienen más de 2 dígitos
+            pattern_rows = []
+            for row in range(1, last_row + 1):
+                if es_cabecera_cuenta(sheet.cell(row=row, column=2).value):
+                    pattern_rows.append(row)
 
-        print(f"🔍 Patrones encontrados: {len(pattern_rows)}")
+            print(f"🔍 Patrones encontrados: {len(pattern_rows)}")
 
-        # 4. Copiar valores a la columna A para los patrones encontrados
-        for i, current_pattern_row in enumerate(pattern_rows):
-            next_pattern_row = pattern_rows[i + 1] if i < len(pattern_rows) - 1 else last_row + 1
-            pattern_value = sheet.cell(row=current_pattern_row, column=2).value
+            # 4. Copiar valores a la columna A para los patrones encontrados
+            for i, current_pattern_row in enumerate(pattern_rows):
+                next_pattern_row = pattern_rows[i + 1] if i < len(pattern_rows) - 1 else last_row + 1
+                pattern_value = sheet.cell(row=current_pattern_row, column=2).value
 
-            for row_num in range(current_pattern_row, next_pattern_row):
-                sheet.cell(row=row_num, column=1).value = pattern_value
+                for row_num in range(current_pattern_row, next_pattern_row):
+                    sheet.cell(row=row_num, column=1).value = pattern_value
 
-        print("✅ Valores copiados a columna A")
+            print("✅ Valores copiados a columna A")
 
         # 5. ELIMINAR COLUMNAS K, L, M (columnas 11, 12, 13)
-        columns_to_delete = [col for col in [11, 12, 13] if col <= last_column]
+        with metricas.medir_etapa(PIPELINE, 'eliminar_columnas'):
+            columns_to_delete = [col for col in [11, 12, 13] if col <= last_column]
 
-        for col in sorted(columns_to_delete, reverse=True):
-            sheet.delete_cols(col)
-            print(f"✅ Columna {get_column_letter(col)} eliminada")
+            for col in sorted(columns_to_delete, reverse=True):
+                sheet.delete_cols(col)
+                print(f"✅ Columna {get_column_letter(col)} eliminada")
 
-        # Actualizar última columna
-        last_column = sheet.max_column
-        print(f"📊 Columnas después de eliminar K,L,M: {last_column}")
+            # Actualizar última columna
+            last_column = sheet.max_column
+            print(f"📊 Columnas después de eliminar K,L,M: {last_column}")
 
         # 6. RESTAR columna I - columna J y resultado en columna I
-        if last_column >= 10:
-            for row in range(7, last_row + 1):
-                try:
-                    valor_i = sheet.cell(row=row, column=9).value
-                    valor_j = sheet.cell(row=row, column=10).value
-
-                    try:
-                        num_i = float(valor_i) if valor_i not in [None, ''] else 0
-                    except (ValueError, TypeError):
-                        num_i = 0
-
+        with metricas.medir_etapa(PIPELINE, 'resta_i_j'):
+            if last_column >= 10:
+                for row in range(7, last_row + 1):
                     try:
-                        num_j = float(valor_j) if valor_j not in [None, ''] else 0
-                    except (ValueError, TypeError):
-                        num_j = 0
+                        valor_i = sheet.cell(row=row, column=9).value
+                        valor_j = sheet.cell(row=row, column=10).value
 
-                    sheet.cell(row=row, column=9).value = num_i - num_j
+                        sheet.cell(row=row, column=9).value = a_numero(valor_i) - a_numero(valor_j)
 
-                except Exception as e:
-                    print(f"⚠️  Error en fila {row}: {str(e)}")
-                    continue
+                    except Exception as e:
+                        print(f"⚠️  Error en fila {row}: {str(e)}")
+                        continue
 
-            print("✅ Resta I - J completada")
+                print("✅ Resta I - J completada")
 
         # 7. AGREGAR CABECERAS en fila 6
         if last_row < 6:
             for _ in range(6 - last_row):
                 sheet.insert_rows(last_row + 1)
 
-        cabeceras = {
-            1: "Cta",
-            2: "Nro",
-            3: "Suc - Tipo - Nro",
-            4: "Fecha",
-            5: "Org.",
-            6: "Nro CPago - Tipo/Serie/ Numero/Fecha de Emision",
-            7: "Glosa / Proveedor",
-            8: "CC",
-            9: "Debe"
-        }
-
-        for col_num, header_text in cabeceras.items():
+        for col_num, header_text in CABECERAS.items():
             if col_num <= last_column:
                 sheet.cell(row=6, column=col_num).value = header_text
 
         print("✅ Cabeceras agregadas en fila 6")
 
         # 8. PROCESAR FECHAS - Convertir y formatear a dd/mm/yyyy
-        filas_a_eliminar = []
-        filas_con_fecha = []
+        with metricas.medir_etapa(PIPELINE, 'filtro_fechas'):
+            filas_a_eliminar = []
+            filas_con_fecha = []
 
-        for row in range(7, last_row + 1):
-            fecha_valor = sheet.cell(row=row, column=4).value
-            fecha_convertida = convertir_a_fecha_dd_mm_yyyy(fecha_valor)
+            for row in range(7, last_row + 1):
+                fecha_valor = sheet.cell(row=row, column=4).value
+                fecha_convertida = convertir_a_fecha_dd_mm_yyyy(fecha_valor)
 
-            if fecha_convertida:
-                fecha_formateada = formatear_fecha_dd_mm_yyyy(fecha_convertida)
+                if fecha_convertida:
+                    fecha_formateada = formatear_fecha_dd_mm_yyyy(fecha_convertida)
 
-                fila_datos = []
-                for col in range(1, last_column + 1):
-                    if col == 4:
-                        fila_datos.append(fecha_formateada)
-                    else:
-                        fila_datos.append(sheet.cell(row=row, column=col).value)
+                    fila_datos = []
+                    for col in range(1, last_column + 1):
+                        if col == 4:
+                            fila_datos.append(fecha_formateada)
+                        else:
+                            fila_datos.append(sheet.cell(row=row, column=col).value)
 
-                filas_con_fecha.append((fecha_convertida, fila_datos))
-            else:
-                filas_a_eliminar.append(row)
+                    filas_con_fecha.append((fecha_convertida, fila_datos))
+                else:
+                    filas_a_eliminar.append(row)
 
-        # Eliminar filas sin fecha válida
-        for row in sorted(filas_a_eliminar, reverse=True):
-            sheet.delete_rows(row)
+            # Eliminar filas sin fecha válida
+            for row in sorted(filas_a_eliminar, reverse=True):
+                sheet.delete_rows(row)
 
-        print(f"✅ Filas sin fecha válida eliminadas: {len(filas_a_eliminar)}")
-        print(f"✅ Filas con fecha válida: {len(filas_con_fecha)}")
+            print(f"✅ Filas sin fecha válida eliminadas: {len(filas_a_eliminar)}")
+            print(f"✅ Filas con fecha válida: {len(filas_con_fecha)}")
 
         # 9. ORDENAR por fecha y ESCRIBIR DATOS
         if filas_con_fecha:
-            filas_con_fecha.sort(key=lambda x: x[0])
+            with metricas.medir_etapa(PIPELINE, 'orden'):
+                filas_con_fecha.sort(key=lambda x: x[0])
 
-            # Limpiar datos existentes desde fila 7
-            for row in range(7, sheet.max_row + 1):
-                for col in range(1, last_column + 1):
-                    sheet.cell(row=row, column=col).value = None
+                # Limpiar datos existentes desde fila 7
+                for row in range(7, sheet.max_row + 1):
+                    for col in range(1, last_column + 1):
+                        sheet.cell(row=row, column=col).value = None
 
-            # Escribir datos ordenados
-            for idx, (fecha_original, fila_datos) in enumerate(filas_con_fecha, 7):
-                for col_idx, valor in enumerate(fila_datos, 1):
-                    if col_idx <= last_column:
-                        sheet.cell(row=idx, column=col_idx).value = valor
+                # Escribir datos ordenados
+                for idx, (fecha_original, fila_datos) in enumerate(filas_con_fecha, 7):
+                    for col_idx, valor in enumerate(fila_datos, 1):
+                        if col_idx <= last_column:
+                            sheet.cell(row=idx, column=col_idx).value = valor
 
-            # Aplicar formato de fecha Excel
-            aplicar_formato_fecha_excel(sheet, 4, 7)
+                # Aplicar formato de fecha Excel
+                aplicar_formato_fecha_excel(sheet, 4, 7)
 
-            print("✅ Datos ordenados por fecha y formateados a dd/mm/yyyy")
+                print("✅ Datos ordenados por fecha y formateados a dd/mm/yyyy")
 
             # 10. APLICAR BORDES Y ESTILOS A LA TABLA
-            fila_inicio_tabla = 6  # Cabeceras
-            fila_fin_tabla = 6 + len(filas_con_fecha)  # Última fila con datos
-            col_inicio_tabla = 1  # Columna A
-            col_fin_tabla = last_column  # Última columna
+            with metricas.medir_etapa(PIPELINE, 'estilos'):
+                fila_inicio_tabla = 6  # Cabeceras
+                fila_fin_tabla = 6 + len(filas_con_fecha)  # Última fila con datos
+                col_inicio_tabla = 1  # Columna A
+                col_fin_tabla = last_column  # Última columna
 
-            # Aplicar bordes a toda la tabla
-            aplicar_bordes_tabla(sheet, fila_inicio_tabla, fila_fin_tabla, col_inicio_tabla, col_fin_tabla)
+                # Aplicar bordes a toda la tabla
+                aplicar_bordes_tabla(sheet, fila_inicio_tabla, fila_fin_tabla, col_inicio_tabla, col_fin_tabla)
 
-            # Aplicar estilo especial a las cabeceras
-            aplicar_estilo_cabeceras(sheet, 6, col_inicio_tabla, col_fin_tabla)
+                # Aplicar estilo especial a las cabeceras
+                aplicar_estilo_cabeceras(sheet, 6, col_inicio_tabla, col_fin_tabla)
 
-            # Ajustar automáticamente el ancho de columnas
-            ajustar_ancho_columnas(sheet)
+                # Ajustar automáticamente el ancho de columnas
+                ajustar_ancho_columnas(sheet)
 
         else:
             print("⚠️  No hay filas con fechas válidas para ordenar")
 
         # 11. Guardar el archivo procesado
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        nombre_base = os.path.splitext(os.path.basename(file_path))[0]
-        nuevo_nombre = f"procesado_{timestamp}_{nombre_base}.xlsx"
-        nuevo_path = os.path.join(os.path.dirname(file_path), nuevo_nombre)
-
-        wb.save(nuevo_path)
-        print(f"💾 Archivo guardado como: {nuevo_nombre}")
+        with metricas.medir_etapa(PIPELINE, 'guardado'):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            nombre_base = os.path.splitext(os.path.basename(file_path))[0]
+            nuevo_nombre = f"procesado_{timestamp}_{nombre_base}.xlsx"
+            nuevo_path = os.path.join(os.path.dirname(file_path), nuevo_nombre)
+
+            wb.save(nuevo_path)
+            print(f"💾 Archivo guardado como: {nuevo_nombre}")
+
+        # 12. Exportar la tabla a formatos columnares
+        if formatos_exportacion:
+            with metricas.medir_etapa(PIPELINE, 'exportacion'):
+                cabeceras_tabla = [sheet.cell(row=6, column=col).value for col in range(1, last_column + 1)]
+                exportar_tabla(nuevo_path, cabeceras_tabla, [fila_datos for _, fila_datos in filas_con_fecha],
+                               formatos_exportacion)
+
+        metricas.incrementar('excel_tools_bytes_salida_total', os.path.getsize(nuevo_path), pipeline=PIPELINE)
+        metricas.incrementar('excel_tools_filas_procesadas_total', len(filas_con_fecha), pipeline=PIPELINE)
+        metricas.incrementar('excel_tools_procesamientos_total', pipeline=PIPELINE, resultado='exito')
 
         return True, nuevo_nombre, len(pattern_rows)
 
@@ -369,8 +409,223 @@ def procesar_excel(file_path: str) -> Tuple[bool, Optional[str], int]:
         print(f"❌ Error crítico en procesar_excel: {str(e)}")
         import traceback
         traceback.print_exc()
+        metricas.incrementar('excel_tools_procesamientos_total', pipeline=PIPELINE, resultado='error')
         return False, None, 0
 
+    finally:
+        metricas.observar('excel_tools_etapa_segundos', time.perf_counter() - inicio, pipeline=PIPELINE, etapa='total')
+
+
+def transformar_filas(filas: list) -> dict:
+    """Aplica la transformación de procesar_excel sobre los valores de una hoja (sin estilos)"""
+    # Columna A insertada al inicio de cada fila
+    filas = [[None] + list(fila) for fila in filas]
+
+    last_row = 0
+    last_column = 0
+    for num_fila, fila in enumerate(filas, 1):
+        for num_columna, valor in enumerate(fila, 1):
+            if valor is not None:
+                last_row = num_fila
+                last_column = max(last_column, num_columna)
+
+    filas = [(fila + [None] * last_column)[:last_column] for fila in filas[:last_row]]
+
+    # Cabeceras de cuenta y copia a la columna A
+    pattern_rows = [num_fila for num_fila, fila in enumerate(filas, 1) if es_cabecera_cuenta(fila[1])]
+    for i, current_pattern_row in enumerate(pattern_rows):
+        next_pattern_row = pattern_rows[i + 1] if i < len(pattern_rows) - 1 else last_row + 1
+        for num_fila in range(current_pattern_row, next_pattern_row):
+            filas[num_fila - 1][0] = filas[current_pattern_row - 1][1]
+
+    # Columnas K, L, M
+    columnas_eliminadas = [col for col in [11, 12, 13] if col <= last_column]
+    for fila in filas:
+        for col in sorted(columnas_eliminadas, reverse=True):
+            del fila[col - 1]
+    last_column -= len(columnas_eliminadas)
+
+    # Resta I - J y filtro de fechas desde la fila 7
+    motivos = {'Sin fecha': 0, 'Fecha no reconocida': 0}
+    filas_con_fecha = []
+    for num_fila, fila in enumerate(filas[6:], 7):
+        if last_column >= 10:
+            fila[8] = a_numero(fila[8]) - a_numero(fila[9])
+
+        fecha_convertida = convertir_a_fecha_dd_mm_yyyy(fila[3]) if last_column >= 4 else None
+        if fecha_convertida:
+            fila[3] = formatear_fecha_dd_mm_yyyy(fecha_convertida)
+            filas_con_fecha.append((fecha_convertida, num_fila, fila))
+        elif last_column < 4 or fila[3] is None or (isinstance(fila[3], str) and not fila[3].strip()):
+            motivos['Sin fecha'] += 1
+        else:
+            motivos['Fecha no reconocida'] += 1
+
+    # Filas 1-5 sin cambios y cabeceras en la fila 6
+    encabezado = filas[:6] + [[None] * last_column for _ in range(6 - len(filas[:6]))]
+    for col_num, header_text in CABECERAS.items():
+        if col_num <= last_column:
+            encabezado[5][col_num - 1] = header_text
+
+    return {
+        'encabezado': encabezado,
+        'filas_con_fecha': filas_con_fecha,
+        'last_row': last_row,
+        'last_column': last_column,
+        'pattern_rows': pattern_rows,
+        'cuentas': [filas[row - 1][1] for row in pattern_rows],
+        'columnas_eliminadas': columnas_eliminadas,
+        'motivos_descarte': motivos,
+    }
+
+
+def previsualizar_excel(file_path: str, max_filas: Optional[int] = None, tamano_muestra: int = 20,
+                        hoja: Optional[str] = None) -> dict:
+    """Analiza una hoja (por defecto la activa) sin estilos ni guardado: conteos, descartes y una muestra"""
+    with metricas.medir_etapa(PIPELINE, 'previsualizacion'):
+        hoja = hoja or nombre_hoja_activa(file_path)
+        transformacion = transformar_filas(leer_filas(file_path, max_filas, hoja=hoja))
+
+        # Muestra de las primeras filas del resultado ordenado por fecha (orden estable)
+        muestra = heapq.nsmallest(tamano_muestra, transformacion['filas_con_fecha'], key=lambda x: (x[0], x[1]))
+
+    motivos = transformacion['motivos_descarte']
+    return {
+        'archivo': os.path.basename(file_path),
+        'hoja_origen': hoja,
+        'filas_leidas': transformacion['last_row'],
+        'limite_filas': max_filas,
+        'patrones_encontrados': len(transformacion['pattern_rows']),
+        'cuentas': transformacion['cuentas'][:tamano_muestra],
+        'columnas_eliminadas': [get_column_letter(col) for col in transformacion['columnas_eliminadas']],
+        'filas_validas': len(transformacion['filas_con_fecha']),
+        'filas_descartadas': sum(motivos.values()),
+        'motivos_descarte': motivos,
+        'cabeceras': transformacion['encabezado'][5],
+        'muestra': [fila for _, _, fila in muestra],
+    }
+
+
+def _transformar_hoja(file_path: str, nombre_hoja: str) -> dict:
+    """Trabajo de un proceso: lee una hoja y devuelve sus filas finales ya ordenadas"""
+    transformacion = transformar_filas(leer_filas(file_path, hoja=nombre_hoja))
+    filas_con_fecha = sorted(transformacion['filas_con_fecha'], key=lambda x: x[0])
+    return {
+        'filas': transformacion['encabezado'] + [fila for _, _, fila in filas_con_fecha],
+        'filas_validas': len(filas_con_fecha),
+        'last_column': transformacion['last_column'],
+        'patrones': len(transformacion['pattern_rows']),
+    }
+
+
+def max_procesos_hojas() -> int:
+    """Procesos de procesar_excel_multihoja por proceso del servidor, compartidos por sus solicitudes"""
+    # Se lee al crear el pool: en gunicorn, servidor.py reparte los núcleos entre los workers
+    return int(os.environ.get('EXCEL_TOOLS_PROCESOS_HOJAS', 0)) or os.cpu_count() or 1
+
+
+def _obtener_pool_hojas() -> ProcessPoolExecutor:
+    """Pool de procesos compartido; usa spawn porque hacer fork desde un servidor con hilos puede bloquear al hijo"""
+    global _pool_hojas
+    with _lock_pool:
+        if _pool_hojas is None:
+            _pool_hojas = ProcessPoolExecutor(max_workers=max_procesos_hojas(),
+                                              mp_context=multiprocessing.get_context('spawn'))
+        return _pool_hojas
+
+
+def _transformar_hojas(file_path: str, nombres: List[str]) -> list:
+    """Transforma cada hoja en un proceso del pool compartido"""
+    global _pool_hojas
+    pool = _obtener_pool_hojas()
+    try:
+        return list(pool.map(_transformar_hoja, [file_path] * len(nombres), nombres))
+    except BrokenProcessPool:
+        # Un proceso murió (p. ej. sin memoria): la próxima solicitud crea un pool nuevo
+        with _lock_pool:
+            if _pool_hojas is pool:
+                _pool_hojas = None
+        raise
+
+
+def procesar_excel_multihoja(file_path: str, hojas: Optional[List[str]] = None,
+                             formatos_exportacion: Optional[List[str]] = None) -> Tuple[bool, Optional[str], dict]:
+    """Procesa todas (o las indicadas) las hojas en paralelo y las reúne en un único libro (exporta cada hoja)"""
+    # Cada hoja sale con los mismos valores que procesar_excel, salvo dos casos porque aquí solo se leen valores:
+    # - textos de solo espacios guardados sin xml:space="preserve" (Excel siempre lo incluye) quedan vacíos
+    # - la fila 6 lleva cabeceras solo hasta la última columna con datos, no hasta celdas vacías con formato
+    inicio = time.perf_counter()
+    try:
+        metricas.incrementar('excel_tools_bytes_entrada_total', os.path.getsize(file_path), pipeline=PIPELINE)
+
+        nombres = [nombre for nombre in listar_hojas(file_path) if not hojas or nombre in hojas]
+        if not nombres:
+            raise ValueError(f"No se encontraron las hojas indicadas: {hojas}")
+
+        # 1. Leer y transformar cada hoja en un proceso distinto
+        with metricas.medir_etapa(PIPELINE, 'transformacion_multihoja'):
+            if len(nombres) == 1 or max_procesos_hojas() == 1:
+                resultados = [_transformar_hoja(file_path, nombre) for nombre in nombres]
+            else:
+                resultados = _transformar_hojas(file_path, nombres)
+
+        print(f"✅ Hojas transformadas: {len(nombres)}")
+
+        # 2. Armar el libro de salida con el mismo estilo que procesar_excel
+        with metricas.medir_etapa(PIPELINE, 'estilos'):
+            wb = Workbook()
+            wb.remove(wb.active)
+            for nombre, resultado in zip(nombres, resultados):
+                sheet = wb.create_sheet(nombre)
+                for fila in resultado['filas']:
+                    sheet.append(fila)
+
+                # procesar_excel deja las filas 1-6 sin formato (eliminar_formatos) y no las reescribe:
+                # sus fechas y horas se guardan como números de serie
+                for fila in sheet.iter_rows(max_row=6):
+                    for cell in fila:
+                        if cell.is_date:
+                            cell.number_format = 'General'
+
+                if resultado['filas_validas']:
+                    aplicar_formato_fecha_excel(sheet, 4, 7)
+                    aplicar_bordes_tabla(sheet, 6, 6 + resultado['filas_validas'], 1, resultado['last_column'])
+                    aplicar_estilo_cabeceras(sheet, 6, 1, resultado['last_column'])
+                    ajustar_ancho_columnas(sheet)
+
+        # 3. Guardar una sola vez
+        with metricas.medir_etapa(PIPELINE, 'guardado'):
+            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+            nombre_base = os.path.splitext(os.path.basename(file_path))[0]
+            nuevo_nombre = f"procesado_{timestamp}_{nombre_base}.xlsx"
+            nuevo_path = os.path.join(os.path.dirname(file_path), nuevo_nombre)
+            wb.save(nuevo_path)
+            print(f"💾 Archivo guardado como: {nuevo_nombre}")
+
+        # 4. Exportar cada hoja a formatos columnares
+        if formatos_exportacion:
+            with metricas.medir_etapa(PIPELINE, 'exportacion'):
+                for nombre, resultado in zip(nombres, resultados):
+                    exportar_tabla(ruta_hoja(nuevo_path, nombre), resultado['filas'][5], resultado['filas'][6:],
+                                   formatos_exportacion)
+
+        metricas.incrementar('excel_tools_bytes_salida_total', os.path.getsize(nuevo_path), pipeline=PIPELINE)
+        metricas.incrementar('excel_tools_filas_procesadas_total',
+                             sum(resultado['filas_validas'] for resultado in resultados), pipeline=PIPELINE)
+        metricas.incrementar('excel_tools_procesamientos_total', pipeline=PIPELINE, resultado='exito')
+
+        return True, nuevo_nombre, {nombre: resultado['patrones'] for nombre, resultado in zip(nombres, resultados)}
+
+    except Exception as e:
+        print(f"❌ Error crítico en procesar_excel_multihoja: {str(e)}")
+        import traceback
+        traceback.print_exc()
+        metricas.incrementar('excel_tools_procesamientos_total', pipeline=PIPELINE, resultado='error')
+        return False, None, {}
+
+    finally:
+        metricas.observar('excel_tools_etapa_segundos', time.perf_counter() - inicio, pipeline=PIPELINE, etapa='total')
+
 
 def validar_procesamiento(file_path: str):
     """Valida que el archivo procesado tenga el formato correcto"""
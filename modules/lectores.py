@@ -0,0 +1,178 @@
+# lectores.py
+import importlib.util
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from datetime import date, datetime
+
+# Motor de lectura: "auto" elige calamine si está instalado y usa openpyxl como respaldo
+MOTOR_LECTURA = os.environ.get('EXCEL_TOOLS_LECTOR', 'auto')
+
+NS_SPREADSHEET = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+
+def calamine_disponible() -> bool:
+    """Indica si python-calamine está instalado"""
+    return importlib.util.find_spec('python_calamine') is not None
+
+
+def _pandas_soporta_calamine() -> bool:
+    """pd.read_excel acepta engine='calamine' desde pandas 2.2"""
+    import pandas as pd
+    version = tuple(int(parte) for parte in pd.__version__.split('.')[:2])
+    return version >= (2, 2)
+
+
+def es_xls(ruta: str) -> bool:
+    """Indica si el archivo está en el formato binario antiguo de Excel"""
+    return os.path.splitext(ruta)[1].lower() == '.xls'
+
+
+def motor_pandas(ruta: str) -> str:
+    """Elige el engine de pd.read_excel para el archivo"""
+    if MOTOR_LECTURA != 'openpyxl' and calamine_disponible() and _pandas_soporta_calamine():
+        return 'calamine'
+    if es_xls(ruta):
+        return 'xlrd'
+    return 'openpyxl'
+
+
+def leer_hoja(ruta: str, hoja, header: int = 0, nrows: int = None):
+    """Lee una hoja como DataFrame (solo valores) con el motor más rápido disponible"""
+    import pandas as pd
+
+    motor = motor_pandas(ruta)
+    try:
+        return pd.read_excel(ruta, sheet_name=hoja, header=header, nrows=nrows, engine=motor)
+    except Exception as e:
+        if motor == 'openpyxl' or es_xls(ruta):
+            raise
+        print(f"⚠️  Lectura con {motor} falló ({str(e)}), usando openpyxl")
+        return pd.read_excel(ruta, sheet_name=hoja, header=header, nrows=nrows, engine='openpyxl')
+
+
+def listar_hojas(ruta: str) -> list:
+    """Devuelve los nombres de las hojas sin cargar el contenido del libro"""
+    if not es_xls(ruta):
+        # En xlsx/xlsm los nombres están en xl/workbook.xml; no hace falta leer las hojas
+        try:
+            with zipfile.ZipFile(ruta) as z:
+                raiz = ET.fromstring(z.read('xl/workbook.xml'))
+            return [hoja.get('name') for hoja in raiz.iter(f'{NS_SPREADSHEET}sheet')]
+        except (KeyError, zipfile.BadZipFile, ET.ParseError):
+            pass
+
+    import pandas as pd
+    with pd.ExcelFile(ruta, engine=motor_pandas(ruta)) as xl:
+        return list(xl.sheet_names)
+
+
+def indice_hoja_activa(ruta: str) -> int:
+    """Posición de la hoja activa (la misma que wb.active en openpyxl) leída de xl/workbook.xml"""
+    if es_xls(ruta):
+        return 0
+    try:
+        with zipfile.ZipFile(ruta) as z:
+            raiz = ET.fromstring(z.read('xl/workbook.xml'))
+        vista = raiz.find(f'{NS_SPREADSHEET}bookViews/{NS_SPREADSHEET}workbookView')
+        return int(vista.get('activeTab', 0)) if vista is not None else 0
+    except (KeyError, ValueError, zipfile.BadZipFile, ET.ParseError):
+        return 0
+
+
+def nombre_hoja_activa(ruta: str) -> str:
+    """Nombre de la hoja que se lee cuando no se indica ninguna"""
+    nombres = listar_hojas(ruta)
+    return nombres[min(indice_hoja_activa(ruta), len(nombres) - 1)]
+
+
+def _normalizar_valor(valor):
+    """Adapta los valores de calamine/xlrd a los tipos que devuelve openpyxl"""
+    if valor == '':
+        return None
+    if isinstance(valor, float) and valor.is_integer():
+        return int(valor)
+    if isinstance(valor, date) and not isinstance(valor, datetime):
+        return datetime(valor.year, valor.month, valor.day)
+    return valor
+
+
+def _leer_filas_calamine(ruta: str, max_filas: int = None, hoja: str = None) -> list:
+    """Lee los valores de una hoja con calamine, con los mismos tipos que openpyxl"""
+    from python_calamine import CalamineWorkbook
+
+    libro = CalamineWorkbook.from_path(ruta)
+    if hoja:
+        sheet = libro.get_sheet_by_name(hoja)
+    else:
+        sheet = libro.get_sheet_by_index(min(indice_hoja_activa(ruta), len(libro.sheet_names) - 1))
+    filas = sheet.to_python(skip_empty_area=False, nrows=max_filas)
+    return [[_normalizar_valor(valor) for valor in fila] for fila in filas]
+
+
+def _leer_valores_xls(ruta: str) -> list:
+    """Lee todas las hojas de un .xls como lista de (nombre, filas de valores)"""
+    if calamine_disponible():
+        from python_calamine import CalamineWorkbook
+
+        libro = CalamineWorkbook.from_path(ruta)
+        return [(nombre, libro.get_sheet_by_name(nombre).to_python(skip_empty_area=False))
+                for nombre in libro.sheet_names]
+
+    import xlrd
+
+    libro = xlrd.open_workbook(ruta)
+    hojas = []
+    for hoja in libro.sheets():
+        filas = []
+        for num_fila in range(hoja.nrows):
+            fila = []
+            for celda in hoja.row(num_fila):
+                if celda.ctype == xlrd.XL_CELL_DATE:
+                    fila.append(xlrd.xldate.xldate_as_datetime(celda.value, libro.datemode))
+                else:
+                    fila.append(celda.value)
+            filas.append(fila)
+        hojas.append((hoja.name, filas))
+    return hojas
+
+
+def cargar_libro(ruta: str):
+    """Carga un libro openpyxl con valores; los .xls se convierten leyendo solo sus valores"""
+    from openpyxl import Workbook, load_workbook
+
+    if not es_xls(ruta):
+        return load_workbook(filename=ruta, data_only=True)
+
+    wb = Workbook()
+    wb.remove(wb.active)
+    for nombre, filas in _leer_valores_xls(ruta):
+        hoja = wb.create_sheet(nombre)
+        for fila in filas:
+            hoja.append([_normalizar_valor(valor) for valor in fila])
+    return wb
+
+
+def leer_filas(ruta: str, max_filas: int = None, hoja: str = None) -> list:
+    """Lee solo los valores de una hoja (por defecto la activa) sin cargar estilos, con calamine si está instalado"""
+    if MOTOR_LECTURA != 'openpyxl' and calamine_disponible():
+        try:
+            return _leer_filas_calamine(ruta, max_filas, hoja)
+        except Exception as e:
+            if es_xls(ruta):
+                raise
+            print(f"⚠️  Lectura con calamine falló ({str(e)}), usando openpyxl")
+
+    if es_xls(ruta):
+        wb = cargar_libro(ruta)
+        sheet = wb[hoja] if hoja else wb.active
+        return [list(fila) for fila in sheet.iter_rows(max_row=max_filas, values_only=True)]
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filename=ruta, read_only=True, data_only=True)
+    try:
+        sheet = wb[hoja] if hoja else wb.active
+        return [list(fila) for fila in sheet.iter_rows(max_row=max_filas, values_only=True)]
+    finally:
+        wb.close()
@@ -0,0 +1,219 @@
+# metricas.py
+import atexit
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Límites (en segundos) de los buckets de los histogramas de duración
+BUCKETS_SEGUNDOS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Descripción y tipo de cada métrica exportada
+DESCRIPCIONES = {
+    'excel_tools_etapa_segundos': ('histogram', 'Duración de cada etapa del procesamiento en segundos'),
+    'excel_tools_procesamientos_total': ('counter', 'Procesamientos ejecutados por pipeline y resultado'),
+    'excel_tools_solicitudes_http_total': ('counter', 'Solicitudes HTTP atendidas por endpoint, método y estado'),
+    'excel_tools_bytes_entrada_total': ('counter', 'Bytes de archivos Excel recibidos por pipeline'),
+    'excel_tools_bytes_salida_total': ('counter', 'Bytes de archivos Excel generados por pipeline'),
+    'excel_tools_filas_procesadas_total': ('counter', 'Filas de datos procesadas por pipeline'),
+}
+
+_lock = threading.Lock()
+_histogramas = {}  # (nombre, etiquetas) -> [conteos por bucket, suma, total]
+_contadores = {}  # (nombre, etiquetas) -> valor
+
+# Con varios procesos (workers de gunicorn) cada uno guarda sus métricas aquí y /metrics suma las de todos
+_directorio_multiproceso = None
+
+# Segundos entre escrituras del archivo del proceso; el registro de métricas nunca escribe en disco
+INTERVALO_GUARDADO = 1.0
+_pendiente = False
+_hilo_guardado = None
+_lock_escritura = threading.Lock()
+
+
+def _reiniciar_tras_fork():
+    """Un proceso hijo empieza con métricas vacías: las heredadas ya las cuenta el proceso padre"""
+    global _lock, _lock_escritura, _pendiente, _hilo_guardado
+    _lock = threading.Lock()
+    _lock_escritura = threading.Lock()
+    _histogramas.clear()
+    _contadores.clear()
+    _pendiente = False
+    _hilo_guardado = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reiniciar_tras_fork)
+
+
+def activar_multiproceso(directorio: str):
+    """Comparte las métricas entre procesos a través de un archivo por proceso en el directorio"""
+    global _directorio_multiproceso
+    os.makedirs(directorio, exist_ok=True)
+    for nombre in os.listdir(directorio):
+        if nombre.startswith('metricas_') and nombre.endswith('.json'):
+            os.remove(os.path.join(directorio, nombre))
+    _directorio_multiproceso = directorio
+
+
+def _marcar_pendiente():
+    """Marca las métricas como modificadas y arranca el hilo que las guarda (se llama con _lock tomado)"""
+    global _pendiente, _hilo_guardado
+    _pendiente = True
+    if _hilo_guardado is None:
+        _hilo_guardado = threading.Thread(target=_guardar_periodicamente, name="metricas", daemon=True)
+        _hilo_guardado.start()
+
+
+def _guardar_periodicamente():
+    """Hilo de cada proceso que vuelca sus métricas al archivo como mucho una vez por intervalo"""
+    while True:
+        time.sleep(INTERVALO_GUARDADO)
+        _guardar_proceso()
+
+
+def _guardar_proceso():
+    """Escribe las métricas de este proceso en su archivo si cambiaron desde la última escritura"""
+    global _pendiente
+    # _lock_escritura ordena las escrituras (hilo y salida del proceso); la E/S queda fuera de _lock
+    with _lock_escritura:
+        with _lock:
+            if not _pendiente or not _directorio_multiproceso:
+                return
+            _pendiente = False
+            datos = {
+                'histogramas': [[nombre, etiquetas, list(d[0]), d[1], d[2]]
+                                for (nombre, etiquetas), d in _histogramas.items()],
+                'contadores': [[nombre, etiquetas, valor] for (nombre, etiquetas), valor in _contadores.items()],
+            }
+
+        ruta = os.path.join(_directorio_multiproceso, f'metricas_{os.getpid()}.json')
+        try:
+            with open(ruta + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(datos, f)
+            os.replace(ruta + '.tmp', ruta)
+        except OSError as e:
+            # Al apagar, el maestro puede haber borrado ya el directorio
+            print(f"⚠️  No se pudieron guardar las métricas ({str(e)})")
+
+
+atexit.register(_guardar_proceso)
+
+
+def _leer_procesos(histogramas: dict, contadores: dict) -> tuple:
+    """Suma a las métricas de este proceso las guardadas por los demás, incluidos los workers ya reiniciados"""
+    propio = f'metricas_{os.getpid()}.json'
+    for nombre_archivo in os.listdir(_directorio_multiproceso):
+        if not (nombre_archivo.startswith('metricas_') and nombre_archivo.endswith('.json')):
+            continue
+        if nombre_archivo == propio:
+            continue
+        try:
+            with open(os.path.join(_directorio_multiproceso, nombre_archivo), encoding='utf-8') as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            continue
+
+        for nombre, etiquetas, conteos, suma, total in datos['histogramas']:
+            clave = (nombre, tuple(tuple(par) for par in etiquetas))
+            acumulado = histogramas.setdefault(clave, ([0] * len(BUCKETS_SEGUNDOS), 0.0, 0))
+            histogramas[clave] = ([a + b for a, b in zip(acumulado[0], conteos)],
+                                  acumulado[1] + suma, acumulado[2] + total)
+        for nombre, etiquetas, valor in datos['contadores']:
+            clave = (nombre, tuple(tuple(par) for par in etiquetas))
+            contadores[clave] = contadores.get(clave, 0) + valor
+
+    return histogramas, contadores
+
+
+def _etiquetas(valores: dict) -> tuple:
+    """Normaliza las etiquetas a una tupla ordenada para usarla como clave"""
+    return tuple(sorted((k, str(v)) for k, v in valores.items()))
+
+
+def observar(nombre: str, valor: float, **etiquetas):
+    """Registra una observación en un histograma"""
+    clave = (nombre, _etiquetas(etiquetas))
+    with _lock:
+        datos = _histogramas.get(clave)
+        if datos is None:
+            datos = [[0] * len(BUCKETS_SEGUNDOS), 0.0, 0]
+            _histogramas[clave] = datos
+
+        for i, limite in enumerate(BUCKETS_SEGUNDOS):
+            if valor <= limite:
+                datos[0][i] += 1
+        datos[1] += valor
+        datos[2] += 1
+
+        if _directorio_multiproceso:
+            _marcar_pendiente()
+
+
+def incrementar(nombre: str, valor: float = 1, **etiquetas):
+    """Incrementa un contador"""
+    clave = (nombre, _etiquetas(etiquetas))
+    with _lock:
+        _contadores[clave] = _contadores.get(clave, 0) + valor
+
+        if _directorio_multiproceso:
+            _marcar_pendiente()
+
+
+@contextmanager
+def medir_etapa(pipeline: str, etapa: str):
+    """Mide la duración de una etapa del pipeline y la registra en el histograma"""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        observar('excel_tools_etapa_segundos', time.perf_counter() - inicio, pipeline=pipeline, etapa=etapa)
+
+
+def _formatear_etiquetas(etiquetas: tuple, extra: tuple = ()) -> str:
+    """Formatea las etiquetas en la sintaxis de Prometheus"""
+    pares = list(etiquetas) + list(extra)
+    if not pares:
+        return ''
+    texto = ','.join('{}="{}"'.format(k, v.replace('\\', '\\\\').replace('"', '\\"')) for k, v in pares)
+    return '{' + texto + '}'
+
+
+def _formatear_valor(valor: float) -> str:
+    """Formatea un número sin decimales innecesarios"""
+    if isinstance(valor, float) and not valor.is_integer():
+        return repr(valor)
+    return str(int(valor))
+
+
+def exportar_prometheus() -> str:
+    """Genera el texto de todas las métricas en formato de exposición de Prometheus"""
+    with _lock:
+        histogramas = {clave: (list(d[0]), d[1], d[2]) for clave, d in _histogramas.items()}
+        contadores = dict(_contadores)
+
+    if _directorio_multiproceso:
+        histogramas, contadores = _leer_procesos(histogramas, contadores)
+
+    lineas = []
+    for nombre, (tipo, descripcion) in DESCRIPCIONES.items():
+        lineas.append(f"# HELP {nombre} {descripcion}")
+        lineas.append(f"# TYPE {nombre} {tipo}")
+
+        if tipo == 'histogram':
+            for (nombre_h, etiquetas), (conteos, suma, total) in sorted(histogramas.items()):
+                if nombre_h != nombre:
+                    continue
+                for limite, conteo in zip(BUCKETS_SEGUNDOS, conteos):
+                    lineas.append(f"{nombre}_bucket{_formatear_etiquetas(etiquetas, (('le', str(limite)),))} {conteo}")
+                lineas.append(f"{nombre}_bucket{_formatear_etiquetas(etiquetas, (('le', '+Inf'),))} {total}")
+                lineas.append(f"{nombre}_sum{_formatear_etiquetas(etiquetas)} {repr(suma)}")
+                lineas.append(f"{nombre}_count{_formatear_etiquetas(etiquetas)} {total}")
+        else:
+            for (nombre_c, etiquetas), valor in sorted(contadores.items()):
+                if nombre_c == nombre:
+                    lineas.append(f"{nombre}{_formatear_etiquetas(etiquetas)} {_formatear_valor(valor)}")
+
+    return '\n'.join(lineas) + '\n'
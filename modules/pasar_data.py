@@ -3,26 +3,29 @@ from openpyxl import load_workbook
 import os
 import shutil
 import re
+import time
 from datetime import datetime
-import hashlib
+from modules import metricas
+from modules.lectores import leer_hoja, listar_hojas
+from modules.exportacion import exportar_tabla
 
-# Configuración de la contraseña (debe ser la misma)
-PASSWORD_HASH = "c8a6ed3ac08087cc037c2fc7846a7f95976b8f5bfbaf2d9540cf89b74452b034"
+PIPELINE = 'pasar_data'
 
-
-def verificar_password(password):
-    """Verifica la contraseña"""
-    if not password:
-        return False
-    hash_input = hashlib.sha256(password.encode()).hexdigest()
-    return hash_input == PASSWORD_HASH
+# Mapeo de columnas: hoja Analisis (origen) -> hoja BD6 (destino)
+MAPEO_COLUMNAS = [
+    {'origen': 'Cta', 'destino': 'CTA', 'col_origen': None, 'col_destino': None},
+    {'origen': 'Suc - Tipo - Nro', 'destino': 'Suc - Tipo - Nro', 'col_origen': 3, 'col_destino': 5},
+    {'origen': 'Fecha', 'destino': 'FECHA', 'col_origen': 4, 'col_destino': 6},
+    {'origen': 'Glosa / Proveedor', 'destino': 'Glosa / Proveedor', 'col_origen': 7, 'col_destino': 9},
+    {'origen': 'CC', 'destino': 'CC', 'col_origen': 8, 'col_destino': 10},
+    {'origen': 'Debe', 'destino': 'Debe', 'col_origen': 9, 'col_destino': 12, 'formato': 'numero'}
+]
 
 
 def obtener_hojas_analisis(origen_path):
     """Obtiene todas las hojas que comienzan con 'Analisis'"""
     try:
-        xl = pd.ExcelFile(origen_path)
-        hojas_analisis = [sheet for sheet in xl.sheet_names if sheet.startswith('Analisis')]
+        hojas_analisis = [sheet for sheet in listar_hojas(origen_path) if sheet.startswith('Analisis')]
 
         if not hojas_analisis:
             raise ValueError("No se encontraron hojas que comiencen con 'Analisis'")
@@ -93,42 +96,48 @@ def formatear_numero(valor):
     return valor
 
 
-def procesar_transferencia(origen_path, destino_path, hoja_seleccionada, password):
-    """Función principal para transferir datos"""
+def verificar_columnas_origen(df_origen):
+    """Verifica que el origen tenga todas las columnas del mapeo"""
+    columnas_faltantes = []
+    for mapeo in MAPEO_COLUMNAS:
+        if mapeo['origen'] not in df_origen.columns:
+            columnas_faltantes.append(mapeo['origen'])
+
+    if columnas_faltantes:
+        raise ValueError(f"Columnas no encontradas en origen: {columnas_faltantes}")
+
+
+def limpiar_datos_origen(df_origen):
+    """Limpia y formatea las columnas del origen que se transfieren"""
+    df_origen['Glosa / Proveedor'] = df_origen['Glosa / Proveedor'].apply(limpiar_glosa_proveedor)
+    df_origen['Fecha'] = df_origen['Fecha'].apply(formatear_fecha)
+    df_origen['Debe'] = df_origen['Debe'].apply(formatear_numero)
+
+
+def procesar_transferencia(origen_path, destino_path, hoja_seleccionada, formatos_exportacion=None):
+    """Función principal para transferir datos (y exportar lo transferido a CSV/Parquet/Arrow)"""
+    inicio = time.perf_counter()
     try:
-        # Verificar contraseña
-        if not verificar_password(password):
-            return False, "Contraseña incorrecta", None, None
-
-        # Configuración de mapeo de columnas
-        mapeo_columnas = [
-            {'origen': 'Cta', 'destino': 'CTA', 'col_origen': None, 'col_destino': None},
-            {'origen': 'Suc - Tipo - Nro', 'destino': 'Suc - Tipo - Nro', 'col_origen': 3, 'col_destino': 5},
-            {'origen': 'Fecha', 'destino': 'FECHA', 'col_origen': 4, 'col_destino': 6},
-            {'origen': 'Glosa / Proveedor', 'destino': 'Glosa / Proveedor', 'col_origen': 7, 'col_destino': 9},
-            {'origen': 'CC', 'destino': 'CC', 'col_origen': 8, 'col_destino': 10},
-            {'origen': 'Debe', 'destino': 'Debe', 'col_origen': 9, 'col_destino': 12, 'formato': 'numero'}
-        ]
+        metricas.incrementar('excel_tools_bytes_entrada_total',
+                             os.path.getsize(origen_path) + os.path.getsize(destino_path), pipeline=PIPELINE)
+
+        # Configuración de mapeo de columnas (copia: col_destino se completa con el archivo destino)
+        mapeo_columnas = [dict(mapeo) for mapeo in MAPEO_COLUMNAS]
 
         # Leer datos del archivo ORIGEN
-        df_origen = pd.read_excel(origen_path, sheet_name=hoja_seleccionada, header=5)
+        with metricas.medir_etapa(PIPELINE, 'carga_origen'):
+            df_origen = leer_hoja(origen_path, hoja_seleccionada, header=5)
 
         # Verificar columnas
-        columnas_faltantes = []
-        for mapeo in mapeo_columnas:
-            if mapeo['origen'] not in df_origen.columns:
-                columnas_faltantes.append(mapeo['origen'])
-
-        if columnas_faltantes:
-            raise ValueError(f"Columnas no encontradas en origen: {columnas_faltantes}")
+        verificar_columnas_origen(df_origen)
 
         # Limpiar y formatear datos
-        df_origen['Glosa / Proveedor'] = df_origen['Glosa / Proveedor'].apply(limpiar_glosa_proveedor)
-        df_origen['Fecha'] = df_origen['Fecha'].apply(formatear_fecha)
-        df_origen['Debe'] = df_origen['Debe'].apply(formatear_numero)
+        with metricas.medir_etapa(PIPELINE, 'limpieza'):
+            limpiar_datos_origen(df_origen)
 
         # Cargar archivo DESTINO
-        libro_destino = load_workbook(destino_path)
+        with metricas.medir_etapa(PIPELINE, 'carga_destino'):
+            libro_destino = load_workbook(destino_path)
 
         if 'BD6' not in libro_destino.sheetnames:
             raise ValueError("No se encontró la hoja 'BD6' en el archivo destino")
@@ -153,40 +162,59 @@ def procesar_transferencia(origen_path, destino_path, hoja_seleccionada, passwor
             raise ValueError(f"Columnas no encontradas en destino: {columnas_destino_faltantes}")
 
         # Limpiar columnas destino
-        for mapeo in mapeo_columnas:
-            col_dest = mapeo['col_destino']
-            for row in range(6, hoja_destino.max_row + 1):
-                hoja_destino.cell(row=row, column=col_dest).value = None
+        with metricas.medir_etapa(PIPELINE, 'limpieza_destino'):
+            for mapeo in mapeo_columnas:
+                col_dest = mapeo['col_destino']
+                for row in range(6, hoja_destino.max_row + 1):
+                    hoja_destino.cell(row=row, column=col_dest).value = None
 
         # Transferir datos
-        filas_transferidas = 0
-        for idx, fila in df_origen.iterrows():
-            fila_destino = 6 + idx
-            tiene_datos = any(pd.notna(fila[mapeo['origen']]) for mapeo in mapeo_columnas)
-
-            if tiene_datos:
-                if fila_destino > hoja_destino.max_row:
-                    nueva_fila = [None] * hoja_destino.max_column
-                    hoja_destino.append(nueva_fila)
-
-                for mapeo in mapeo_columnas:
-                    valor = fila[mapeo['origen']]
-                    if pd.notna(valor):
-                        if mapeo.get('formato') == 'numero' and isinstance(valor, (int, float)):
-                            hoja_destino.cell(row=fila_destino, column=mapeo['col_destino']).value = float(valor)
-                        else:
-                            hoja_destino.cell(row=fila_destino, column=mapeo['col_destino']).value = valor
-
-                filas_transferidas += 1
+        with metricas.medir_etapa(PIPELINE, 'transferencia'):
+            filas_transferidas = 0
+            filas_exportacion = []
+            for idx, fila in df_origen.iterrows():
+                fila_destino = 6 + idx
+                tiene_datos = any(pd.notna(fila[mapeo['origen']]) for mapeo in mapeo_columnas)
+
+                if tiene_datos:
+                    if fila_destino > hoja_destino.max_row:
+                        nueva_fila = [None] * hoja_destino.max_column
+                        hoja_destino.append(nueva_fila)
+
+                    for mapeo in mapeo_columnas:
+                        valor = fila[mapeo['origen']]
+                        if pd.notna(valor):
+                            if mapeo.get('formato') == 'numero' and isinstance(valor, (int, float)):
+                                hoja_destino.cell(row=fila_destino, column=mapeo['col_destino']).value = float(valor)
+                            else:
+                                hoja_destino.cell(row=fila_destino, column=mapeo['col_destino']).value = valor
+
+                    if formatos_exportacion:
+                        filas_exportacion.append([fila[mapeo['origen']] if pd.notna(fila[mapeo['origen']]) else None
+                                                  for mapeo in mapeo_columnas])
+
+                    filas_transferidas += 1
 
         # Crear backup
-        nombre_base = os.path.splitext(destino_path)[0]
-        extension = os.path.splitext(destino_path)[1]
-        backup_path = f"{nombre_base}_backup{extension}"
-        shutil.copy2(destino_path, backup_path)
+        with metricas.medir_etapa(PIPELINE, 'backup'):
+            nombre_base = os.path.splitext(destino_path)[0]
+            extension = os.path.splitext(destino_path)[1]
+            backup_path = f"{nombre_base}_backup{extension}"
+            shutil.copy2(destino_path, backup_path)
 
         # Guardar cambios
-        libro_destino.save(destino_path)
+        with metricas.medir_etapa(PIPELINE, 'guardado'):
+            libro_destino.save(destino_path)
+
+        # Exportar los datos transferidos a formatos columnares
+        if formatos_exportacion:
+            with metricas.medir_etapa(PIPELINE, 'exportacion'):
+                exportar_tabla(destino_path, [mapeo['destino'] for mapeo in mapeo_columnas], filas_exportacion,
+                               formatos_exportacion)
+
+        metricas.incrementar('excel_tools_bytes_salida_total', os.path.getsize(destino_path), pipeline=PIPELINE)
+        metricas.incrementar('excel_tools_filas_procesadas_total', filas_transferidas, pipeline=PIPELINE)
+        metricas.incrementar('excel_tools_procesamientos_total', pipeline=PIPELINE, resultado='exito')
 
         # Preparar resumen
         resumen = {
@@ -201,4 +229,43 @@ def procesar_transferencia(origen_path, destino_path, hoja_seleccionada, passwor
         return True, "Transferencia completada exitosamente", resumen, destino_path
 
     except Exception as e:
+        metricas.incrementar('excel_tools_procesamientos_total', pipeline=PIPELINE, resultado='error')
         return False, f"Error durante la transferencia: {str(e)}", None, None
+
+    finally:
+        metricas.observar('excel_tools_etapa_segundos', time.perf_counter() - inicio, pipeline=PIPELINE, etapa='total')
+
+
+def previsualizar_transferencia(origen_path, hoja_seleccionada, max_filas=None, tamano_muestra=20):
+    """Analiza el origen sin tocar el destino: filas a transferir, descartes y una muestra"""
+    with metricas.medir_etapa(PIPELINE, 'previsualizacion'):
+        df_origen = leer_hoja(origen_path, hoja_seleccionada, header=5, nrows=max_filas)
+        verificar_columnas_origen(df_origen)
+        limpiar_datos_origen(df_origen)
+
+        columnas = [mapeo['origen'] for mapeo in MAPEO_COLUMNAS]
+        tiene_datos = df_origen[columnas].notna().any(axis=1)
+        transferibles = df_origen.loc[tiene_datos, columnas]
+
+        fechas = transferibles['Fecha'].dropna()
+        montos = transferibles['Debe'].dropna()
+        avisos = {
+            'Fecha no reconocida': int(fechas.apply(lambda f: isinstance(f, str)).sum()),
+            'Debe no numérico': int(montos.apply(lambda v: not isinstance(v, (int, float))).sum()),
+        }
+
+        muestra = [[None if pd.isna(valor) else valor for valor in fila]
+                   for fila in transferibles.head(tamano_muestra).itertuples(index=False)]
+
+    return {
+        'archivo_origen': os.path.basename(origen_path),
+        'hoja_origen': hoja_seleccionada,
+        'filas_leidas': len(df_origen),
+        'limite_filas': max_filas,
+        'filas_transferidas': int(tiene_datos.sum()),
+        'filas_descartadas': int((~tiene_datos).sum()),
+        'motivos_descarte': {'Sin datos en las columnas transferidas': int((~tiene_datos).sum())},
+        'avisos': avisos,
+        'cabeceras': [mapeo['destino'] for mapeo in MAPEO_COLUMNAS],
+        'muestra': muestra,
+    }
@@ -0,0 +1,82 @@
+# perfilado.py
+import cProfile
+import os
+import random
+import re
+import threading
+import tracemalloc
+from datetime import datetime
+
+PERFILES_FOLDER = 'perfiles'
+TOP_ASIGNACIONES = 25
+
+# cProfile y tracemalloc son globales al proceso: solo se perfila un trabajo a la vez
+_lock = threading.Lock()
+
+
+def debe_perfilar(solicitado: bool, porcentaje: float) -> bool:
+    """Decide si la ejecución actual se perfila (solicitud explícita o muestreo)"""
+    if solicitado:
+        return True
+    return porcentaje > 0 and random.random() * 100 < porcentaje
+
+
+def ejecutar_con_perfil(nombre: str, funcion, *args, **kwargs):
+    """Ejecuta la función bajo cProfile y tracemalloc y guarda el perfil resultante"""
+    if not _lock.acquire(blocking=False):
+        print("⚠️  Ya hay un perfilado en curso, se ejecuta sin perfilar")
+        return funcion(*args, **kwargs)
+
+    try:
+        os.makedirs(PERFILES_FOLDER, exist_ok=True)
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+        nombre_base = f"{timestamp}_{re.sub(r'[^A-Za-z0-9_.-]', '_', nombre)}"
+
+        tracemalloc.start()
+        perfil = cProfile.Profile()
+        try:
+            perfil.enable()
+            try:
+                return funcion(*args, **kwargs)
+            finally:
+                perfil.disable()
+                snapshot = tracemalloc.take_snapshot()
+                _, pico = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+            perfil.dump_stats(os.path.join(PERFILES_FOLDER, f"{nombre_base}.prof"))
+            guardar_resumen_memoria(os.path.join(PERFILES_FOLDER, f"{nombre_base}_memoria.txt"), snapshot, pico)
+            print(f"🔬 Perfil guardado como: {nombre_base}.prof")
+
+    finally:
+        _lock.release()
+
+
+def guardar_resumen_memoria(ruta: str, snapshot, pico: int):
+    """Escribe el pico de memoria y las asignaciones principales de tracemalloc"""
+    estadisticas = snapshot.statistics('lineno')[:TOP_ASIGNACIONES]
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(f"Pico de memoria: {pico / (1024 * 1024):.2f} MiB\n\n")
+        f.write(f"Top {TOP_ASIGNACIONES} asignaciones:\n")
+        for estadistica in estadisticas:
+            f.write(f"{estadistica}\n")
+
+
+def listar_perfiles():
+    """Lista los archivos de perfil guardados, del más reciente al más antiguo"""
+    if not os.path.isdir(PERFILES_FOLDER):
+        return []
+
+    perfiles = []
+    for nombre in os.listdir(PERFILES_FOLDER):
+        ruta = os.path.join(PERFILES_FOLDER, nombre)
+        if os.path.isfile(ruta):
+            perfiles.append({
+                'nombre': nombre,
+                'tamano': os.path.getsize(ruta),
+                'fecha': datetime.fromtimestamp(os.path.getmtime(ruta)),
+            })
+
+    perfiles.sort(key=lambda p: p['fecha'], reverse=True)
+    return perfiles
@@ -0,0 +1,230 @@
+import argparse
+import importlib
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import time
+import _thread
+
+from auth import cargar_configuracion
+from modules import metricas
+
+# Valores por defecto de la sección "servidor" de config.json
+CONFIG_SERVIDOR = {
+    "modo": "waitress",  # desarrollo | waitress | gunicorn
+    "host": "127.0.0.1",
+    "puerto": 5000,
+    "workers": 2,  # procesos (solo gunicorn)
+    "threads": 8,  # hilos por proceso
+    "timeout": 300,  # segundos máximos por solicitud (archivos grandes)
+    "timeout_apagado": 120,  # segundos para terminar trabajos en curso al apagar
+    "precalentar": True,  # importar pandas/openpyxl en segundo plano tras el arranque
+}
+
+MODULOS_PESADOS = ['pandas', 'openpyxl', 'modules.insertar_columna', 'modules.pasar_data']
+
+
+def obtener_config_servidor(argumentos=None):
+    """Combina los valores por defecto, config.json y los argumentos de línea de comandos"""
+    config = dict(CONFIG_SERVIDOR)
+    config.update(cargar_configuracion().get("servidor", {}))
+
+    if argumentos:
+        for clave, valor in vars(argumentos).items():
+            if valor is not None:
+                config[clave] = valor
+
+    return config
+
+
+def precargar_modulos():
+    """Importa las dependencias pesadas una sola vez (antes de crear workers)"""
+    inicio = time.perf_counter()
+    for modulo in MODULOS_PESADOS:
+        importlib.import_module(modulo)
+    print(f"📦 Módulos precargados en {time.perf_counter() - inicio:.2f} s")
+
+
+def precalentar_en_segundo_plano():
+    """Precarga los módulos pesados en un hilo para no retrasar el arranque del servidor"""
+    hilo = threading.Thread(target=precargar_modulos, name="precalentamiento", daemon=True)
+    hilo.start()
+    return hilo
+
+
+class RespuestaContada:
+    """Envuelve el cuerpo de una respuesta WSGI para avisar cuando el servidor la termina de enviar"""
+
+    def __init__(self, respuesta, al_terminar):
+        self.respuesta = respuesta
+        self.al_terminar = al_terminar
+
+    def __iter__(self):
+        return iter(self.respuesta)
+
+    def close(self):
+        try:
+            if hasattr(self.respuesta, 'close'):
+                self.respuesta.close()
+        finally:
+            self.al_terminar()
+
+
+class ControlTrabajos:
+    """Middleware WSGI que cuenta solicitudes en curso y rechaza nuevas durante el apagado"""
+
+    def __init__(self, app):
+        self.app = app
+        self.en_curso = 0
+        self.apagando = False
+        self._lock = threading.Lock()
+
+    def __call__(self, environ, start_response):
+        with self._lock:
+            if self.apagando:
+                start_response('503 Service Unavailable', [('Content-Type', 'text/plain; charset=utf-8'),
+                                                           ('Retry-After', '30')])
+                return [b'Servidor reiniciandose, intente nuevamente']
+            self.en_curso += 1
+
+        try:
+            respuesta = self.app(environ, start_response)
+        except Exception:
+            self._terminar()
+            raise
+        return RespuestaContada(respuesta, self._terminar)
+
+    def _terminar(self):
+        with self._lock:
+            self.en_curso -= 1
+
+    def esperar(self, timeout: float) -> bool:
+        """Espera a que terminen las solicitudes en curso; devuelve False si se agotó el tiempo"""
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            with self._lock:
+                if self.en_curso == 0:
+                    return True
+            time.sleep(0.2)
+        return False
+
+
+def servir_desarrollo(app, config):
+    """Servidor de desarrollo de Flask con recarga y depurador"""
+    app.run(host=config["host"], port=config["puerto"], debug=True)
+
+
+def servir_waitress(app, config):
+    """Servidor multihilo waitress (funciona también en Windows y en el ejecutable)"""
+    from waitress.server import create_server
+
+    control = ControlTrabajos(app)
+    servidor = create_server(control, host=config["host"], port=config["puerto"],
+                             threads=config["threads"], channel_timeout=config["timeout"])
+
+    def drenar():
+        if not control.esperar(config["timeout_apagado"]):
+            print("⚠️  Tiempo de apagado agotado con trabajos en curso")
+        # Margen para que waitress termine de enviar las últimas respuestas
+        time.sleep(1)
+        # interrupt_main() invoca detener() en el hilo principal, que ya con apagando=True corta servidor.run()
+        _thread.interrupt_main()
+
+    def detener(signum, frame):
+        if control.apagando:
+            # Fin del drenaje, o una segunda señal del usuario: apagado inmediato
+            raise KeyboardInterrupt
+        print("🛑 Apagando: esperando a que terminen los trabajos en curso...")
+        control.apagando = True
+        threading.Thread(target=drenar, daemon=True).start()
+
+    signal.signal(signal.SIGINT, detener)
+    signal.signal(signal.SIGTERM, detener)
+
+    print(f"🚀 waitress escuchando en http://{config['host']}:{config['puerto']} "
+          f"({config['threads']} hilos)")
+    try:
+        servidor.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.close()
+        print("✅ Servidor detenido")
+
+
+def servir_gunicorn(app, config):
+    """Servidor gunicorn multiproceso; la aplicación se carga en el proceso padre antes del fork"""
+    from gunicorn.app.base import BaseApplication
+
+    class AplicacionGunicorn(BaseApplication):
+        def load_config(self):
+            opciones = {
+                "bind": f"{config['host']}:{config['puerto']}",
+                "workers": config["workers"],
+                "threads": config["threads"],
+                "timeout": config["timeout"],
+                "graceful_timeout": config["timeout_apagado"],
+                "preload_app": True,
+            }
+            for clave, valor in opciones.items():
+                self.cfg.set(clave, valor)
+
+        def load(self):
+            return app
+
+    # Cada worker tiene su propio pool para procesar_excel_multihoja: se reparten los núcleos entre ellos
+    os.environ.setdefault('EXCEL_TOOLS_PROCESOS_HOJAS', str(max(1, (os.cpu_count() or 1) // config["workers"])))
+
+    # Cada worker guarda sus métricas en este directorio y /metrics devuelve la suma de todos
+    directorio_metricas = tempfile.mkdtemp(prefix='excel_tools_metricas_')
+    metricas.activar_multiproceso(directorio_metricas)
+    pid_maestro = os.getpid()
+
+    print(f"🚀 gunicorn escuchando en http://{config['host']}:{config['puerto']} "
+          f"({config['workers']} workers x {config['threads']} hilos)")
+    try:
+        AplicacionGunicorn().run()
+    finally:
+        # Los workers también salen por aquí (sys.exit tras el fork); solo el maestro borra el directorio
+        if os.getpid() == pid_maestro:
+            shutil.rmtree(directorio_metricas, ignore_errors=True)
+
+
+SERVIDORES = {
+    "desarrollo": servir_desarrollo,
+    "waitress": servir_waitress,
+    "gunicorn": servir_gunicorn,
+}
+
+
+def main(argv=None, app=None):
+    """Inicia el servidor; recibe la aplicación cuando app.py se ejecuta directamente (como __main__)"""
+    parser = argparse.ArgumentParser(description="Servidor de la Suite de Herramientas Excel")
+    parser.add_argument('--modo', choices=list(SERVIDORES))
+    parser.add_argument('--host')
+    parser.add_argument('--puerto', type=int)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--threads', type=int)
+    config = obtener_config_servidor(parser.parse_args(argv))
+
+    modo = config["modo"]
+    if modo == "gunicorn":
+        # Los workers heredan los módulos ya importados en el proceso padre
+        precargar_modulos()
+    elif config["precalentar"]:
+        precalentar_en_segundo_plano()
+
+    if app is None:
+        from app import app
+
+    try:
+        SERVIDORES[modo](app, config)
+    except ImportError as e:
+        print(f"⚠️  No se pudo iniciar el modo '{modo}' ({str(e)}), usando el servidor integrado de Flask")
+        app.run(host=config["host"], port=config["puerto"], threaded=True)
+
+
+if __name__ == '__main__':
+    main()